@@ -0,0 +1,236 @@
+"""Benchmark suite for TypeGame, with stored baselines for regression checks.
+
+Runs headless (SDL dummy video driver). Usage:
+
+    python benchmarks/bench_typegame.py            # run and compare to baseline
+    python benchmarks/bench_typegame.py --save     # record a new baseline
+
+Baselines are machine-specific: record one on the machine that runs the checks.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pygame  # noqa: E402
+
+import typegame.game  # noqa: E402
+from typegame.game import Game  # noqa: E402
+from typegame.ngram import NgramGenerator, NgramModel, train  # noqa: E402
+from typegame.session import TypingSession  # noqa: E402
+from typegame.simulation import replay, synthetic_typist  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+BENCHMARKS = {}
+
+
+def benchmark(unit_count=1):
+    """Register a benchmark; it returns a callable timed per call.
+
+    unit_count: work items per call (e.g. keystrokes) used for the rate column.
+    """
+    def register(setup):
+        BENCHMARKS[setup.__name__[len("bench_"):]] = (setup, unit_count)
+        return setup
+    return register
+
+
+def measure(fn, repeat=7, min_time=0.05):
+    """Median seconds per call, calling fn enough times per sample to be measurable."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time or number >= 1 << 16:
+            break
+        number *= 2
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples)
+
+
+_game = None
+
+
+def get_game():
+    """Shared headless game instance (created once)."""
+    global _game
+    if _game is None:
+        _game = Game()
+        _game.results_history = [{"date": f"2025-01-{i + 1:02d}", "wpm": 40 + i % 7, "accuracy": 95.0}
+                                 for i in range(20)]
+    return _game
+
+
+REPLAY_KEYSTROKES = 20000
+
+
+@benchmark(unit_count=REPLAY_KEYSTROKES)
+def bench_replay_keystrokes():
+    """Replay a recorded synthetic stream through a fresh session."""
+    # The same sentences every run: the workload depends on their lengths
+    generator = get_game().sentence_generator
+    generator.rng.seed(1)
+    sentences = generator.generate_many(500)
+    stream = []
+
+    def recording(keystrokes):
+        for keystroke in keystrokes:
+            stream.append(keystroke)
+            yield keystroke
+
+    # Record a stream by letting the synthetic typist play a live session
+    it = iter(sentences * 100)
+    recorder = TypingSession()
+    recorder.start_sentence(next(it))
+    replay(recording(synthetic_typist(recorder, rng=random.Random(1), limit=REPLAY_KEYSTROKES)),
+           lambda: next(it), session=recorder)
+
+    def run():
+        it = iter(sentences * 100)
+        replay(stream, lambda: next(it))
+    return run
+
+
+@benchmark(unit_count=1000)
+def bench_generate_sentences():
+    generator = get_game().sentence_generator
+    return lambda: generator.generate_many(1000)
+
+
+@benchmark(unit_count=1000)
+def bench_generate_sentences_ngram():
+    """Sentences from a bigram model trained on generated text, used through mmap."""
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus.txt")
+        with open(corpus, "w", encoding="utf-8") as f:
+            f.write(".\n".join(get_game().sentence_generator.generate_many(5000)))
+        path = os.path.join(tmp, "model.tgng")
+        train([corpus]).save(path)
+        generator = NgramGenerator(NgramModel.load(path), random.Random(1))
+    return lambda: generator.generate_many(1000)
+
+
+@benchmark()
+def bench_draw_playing_screen():
+    """Full repaint of the playing screen mid-sentence."""
+    game = get_game()
+    game.game_state = "playing"
+    game.session.reset()
+    game.new_sentence()
+    for char in game.current_sentence[:len(game.current_sentence) // 2]:
+        game.session.type_char(char, pygame.time.get_ticks())
+
+    def run():
+        game.damage.invalidate()
+        game.draw_playing_screen()
+    return run
+
+
+@benchmark()
+def bench_draw_results_screen():
+    """Full repaint of the results screen with history graph."""
+    game = get_game()
+    game.current_result = {"date": "2025-01-01", "wpm": 62, "accuracy": 97.5, "time": 42.0,
+                           "characters_typed": 220, "errors": 3, "sentences_completed": 3}
+
+    def run():
+        game.damage.invalidate()
+        game.draw_results_screen()
+    return run
+
+
+@benchmark()
+def bench_startup():
+    """Game construction (window, fonts, words from the compiled pack)."""
+    return lambda: Game()
+
+
+@benchmark()
+def bench_load_words_cached():
+    game = get_game()
+    return game.load_words_from_csv
+
+
+@benchmark()
+def bench_filter_words_csv():
+    """Cold word loading: scanning and filtering the whole CSV."""
+    game = get_game()
+    csv_path = os.path.join(os.path.dirname(__file__), "..", "assets", "words", "words.csv")
+    return lambda: game.filter_csv_words(csv_path)
+
+
+def run_benchmarks(names=None):
+    results = {}
+    for name, (setup, units) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        seconds = measure(setup())
+        results[name] = {"seconds": seconds, "per_second": units / seconds}
+        print(f"{name:<24} {seconds * 1000:10.3f} ms   {units / seconds:14,.0f} /s")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print slowdowns against the baseline; return True if any exceeds tolerance."""
+    regressed = False
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<24} no baseline (record one with --save)")
+            continue
+        ratio = result["seconds"] / baseline[name]["seconds"]
+        flag = "REGRESSION" if ratio > tolerance else "ok"
+        regressed |= ratio > tolerance
+        print(f"{name:<24} {ratio:6.2f}x baseline   {flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TypeGame benchmarks")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="slowdown factor reported as a regression (default: 1.5)")
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    pygame.font.init()
+    # Compile the word pack outside the source tree; later games read it back
+    with tempfile.TemporaryDirectory() as tmp:
+        typegame.game.WORDS_CACHE = os.path.join(tmp, "words.pack")
+        results = run_benchmarks(args.names)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(),
+                       "results": results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nCompared to baseline from {baseline.get('machine', '?')}:")
+        if compare(results, baseline["results"], args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""Shared test fixtures."""
+
+import pytest
+
+import typegame.game
+
+
+@pytest.fixture(autouse=True)
+def words_cache(tmp_path, monkeypatch):
+    """Compile the bundled word list into a temporary pack, not into the source tree."""
+    path = str(tmp_path / "words.pack")
+    monkeypatch.setattr(typegame.game, "WORDS_CACHE", path)
+    return path
@@ -0,0 +1,36 @@
+"""Tests for the analytics module."""
+
+import numpy as np
+
+from typegame import analytics
+from typegame.keylog import BACKSPACE, KeystrokeLog
+
+
+def make_result(wpm, keys=""):
+    log = KeystrokeLog()
+    for i, (expected, typed) in enumerate(keys):
+        log.record(i * 200, expected, typed)
+    return {"wpm": wpm, "accuracy": 90.0 + wpm % 10, "keystrokes": log.encode()}
+
+
+def test_rolling_mean_and_trend():
+    """Rolling means use the available values at the start; trend is the fitted slope."""
+    values = np.array([10, 20, 30, 40], dtype=float)
+    assert analytics.rolling_mean(values, 2).tolist() == [10, 15, 25, 35]
+    slope, intercept = analytics.trend(values)
+    assert round(slope, 6) == 10 and round(intercept, 6) == 10
+
+
+def test_keystroke_metrics():
+    """Keystroke logs feed the error heatmap and rhythm consistency."""
+    results = [make_result(40, [("a", "a"), ("b", "x"), ("", BACKSPACE), ("b", "b")]),
+               make_result(50, [("a", "s"), ("a", "a")])]
+    deltas, expected, typed = analytics.keystroke_arrays(results)
+    assert deltas.size == 6
+    assert analytics.error_heatmap(expected, typed) == {"a": (3, 1), "b": (2, 1)}
+    assert analytics.consistency(deltas) == (200.0, 0.0, 0.0)
+
+    summary = analytics.summarize(results + [{"wpm": 60, "accuracy": 99.0}])
+    assert summary["sessions"] == 3 and summary["wpm_best"] == 60
+    assert summary["keystrokes"] == 6
+    assert analytics.format_report(summary)
@@ -0,0 +1,34 @@
+"""Tests for the corpus pipeline."""
+
+from typegame.corpus import CorpusFilter, build_pack, count_words, rank_words, tokenize
+from typegame.wordpack import read_pack
+
+
+def test_tokenize():
+    """Count columns weigh words; identifiers split on underscores, digits and case."""
+    assert tokenize("hello,120") == (["hello"], 120)
+    assert tokenize("words\t7\n") == (["words"], 7)
+    assert tokenize("sold for 3,000") == (["sold", "for"], 1)
+    assert tokenize("Don't stop") == (["don", "t", "stop"], 1)
+    assert tokenize("parse_HTTPHeader2value", split_case=True) == (["parse", "http", "header", "value"], 1)
+
+
+def test_filter_stages():
+    """Words failing any stage are dropped."""
+    stages = CorpusFilter(exclude="tion$").stages()
+    accepted = [word for word in ["dog", "jazz", "hmm", "booo", "toolongword", "nation", "house"]
+                if all(stage(word) for stage in stages)]
+    assert accepted == ["dog", "house"]
+
+
+def test_ranked_pack_parallel(tmp_path):
+    """Frequency ranking is the same with worker processes and small chunks."""
+    source = tmp_path / "corpus.txt"
+    source.write_text("the cat and the dog\n" * 50 + "zebra bird\nbird\nwords,500\n", encoding="utf-8")
+    counts = count_words([str(source)])
+    assert rank_words(counts, 10) == ["words", "the", "cat", "and", "dog", "bird", "zebra"]
+    assert count_words([str(source)], jobs=2, chunk_lines=7) == counts
+
+    output = str(tmp_path / "words.pack")
+    assert build_pack([str(source)], output, limit=3) == ["words", "the", "cat"]
+    assert read_pack(output) == ["words", "the", "cat"]
@@ -1,7 +1,13 @@
 """Tests for the TypeGame."""
 
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
 import pytest
-from typegame.game import Game
+from typegame.game import BUILTIN_WORDS, Game
+from typegame.results import ResultsJournal
 
 
 def test_game_initialization():
@@ -17,4 +23,38 @@ def test_word_list():
     words = ["python", "pygame", "typing", "game", "code", "program", 
              "computer", "keyboard", "developer", "software"]
     assert len(words) > 0
-    assert all(isinstance(word, str) for word in words)
\ No newline at end of file
+    assert all(isinstance(word, str) for word in words)
+
+
+def test_headless_game_plays_sentences(tmp_path):
+    """A game can be driven headless through injected keyboard events."""
+    pygame.display.init()
+    pygame.font.init()
+    game = Game()
+    game.results_store = ResultsJournal(str(tmp_path / "results.jsonl"))
+    
+    for _ in range(3):
+        events = [pygame.event.Event(pygame.KEYDOWN, key=0, unicode=char, mod=0)
+                  for char in game.current_sentence]
+        game.handle_events(events)
+        game.draw()
+    
+    assert game.game_state == "finished"
+    assert game.current_result["sentences_completed"] == 3
+    assert game.current_result["errors"] == 0
+    assert len(game.results_store.tail(5)) == 1
+
+
+def test_vocabulary_follows_csv_frequency_order(tmp_path):
+    """Built-in words take their CSV rank; without a rank they come last and are picked uniformly."""
+    pygame.display.init()
+    pygame.font.init()
+    game = Game()
+    csv_path = tmp_path / "words.csv"
+    csv_path.write_text("word\nmeeting\nhouse\nthe\nzebra\n", encoding="utf-8")
+
+    words = game.filter_csv_words(str(csv_path))
+    assert words[:4] == ["meeting", "house", "the", "zebra"]
+    assert words[4:] == [word for word in BUILTIN_WORDS if word not in words[:4]]
+    assert game.make_sentence_generator(words).frequency_exponent == 1.0
+    assert game.make_sentence_generator(list(BUILTIN_WORDS)).frequency_exponent == 0.0
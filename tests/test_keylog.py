@@ -0,0 +1,39 @@
+"""Tests for the keystroke ring buffer."""
+
+from typegame.keylog import BACKSPACE, KeystrokeLog
+
+
+def test_records_deltas_and_correctness():
+    """Each keystroke stores the time since the previous one and whether it was right."""
+    log = KeystrokeLog(capacity=8)
+    log.record(1000, "a", "a")
+    log.record(1150, "b", "x")
+    log.record(1400, "", BACKSPACE)
+    deltas, expected, typed, correct = log.snapshot()
+    assert list(deltas) == [0, 150, 250]
+    assert typed == "ax" + BACKSPACE
+    assert list(correct) == [1, 0, 0]
+
+
+def test_ring_keeps_latest_and_round_trips():
+    """A full ring keeps the newest keystrokes and survives encode/decode."""
+    log = KeystrokeLog(capacity=4)
+    for i, char in enumerate("abcdef"):
+        log.record(i * 100, char, char)
+    assert len(log) == 4 and log.count == 6
+    assert log.snapshot()[2] == "cdef"
+    decoded = KeystrokeLog.decode(log.encode())
+    assert decoded.snapshot()[1:] == log.snapshot()[1:]
+    assert list(decoded.snapshot()[0]) == [100, 100, 100, 100]
+
+
+def test_error_rates():
+    """Letters typed often enough report their error rate; spaces and backspaces are ignored."""
+    log = KeystrokeLog()
+    for i in range(10):
+        log.record(i, "a", "a" if i % 5 else "s")
+        log.record(i, "b", "b")
+        log.record(i, " ", "x")
+        log.record(i, "", BACKSPACE)
+    log.record(20, "q", "w")
+    assert log.error_rates() == {"a": 0.2}
@@ -0,0 +1,41 @@
+"""Tests for key-to-screen latency tracking."""
+
+import json
+
+from typegame.latency import LatencyHistogram, LatencyTracker
+
+
+def test_histogram_percentiles_roll_over_window():
+    """Percentiles are bucket upper edges over the most recent samples only."""
+    histogram = LatencyHistogram(bucket_ms=1.0, buckets=100, window=10)
+    assert histogram.percentile(50) is None
+    for ms in [2.5] * 9 + [40.0]:
+        histogram.add(ms)
+    assert histogram.percentiles() == {"p50": 3.0, "p95": 41.0, "p99": 41.0}
+    for _ in range(10):
+        histogram.add(500.0)  # Beyond the last bucket: overflow
+    assert histogram.size == 10 and histogram.total == 20
+    assert histogram.percentile(50) == 101.0
+    assert sum(histogram.counts) == 10
+
+
+def test_tracker_stages(tmp_path):
+    """Keys of one frame share the update, render and present timestamps."""
+    times = iter([0.0, 0.0011, 0.0041, 0.0101])
+    tracker = LatencyTracker(clock=lambda: next(times))
+    tracker.presented()  # No keys pending: nothing recorded, clock untouched
+    tracker.keys_received(2)
+    tracker.updated()
+    tracker.rendered()
+    tracker.presented()
+    assert tracker.version == 1
+    summary = tracker.summary()
+    assert summary["update"]["p50"] == 1.25
+    assert summary["render"]["p50"] == 4.25
+    assert summary["present"]["p99"] == 10.25
+    assert tracker.histograms["present"].size == 2
+
+    path = tmp_path / "latency.json"
+    tracker.dump(str(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["present"]["samples"] == 2 and sum(data["present"]["counts"]) == 2
@@ -0,0 +1,36 @@
+"""Tests for the typing-area text layout."""
+
+import pygame
+import pytest
+
+from typegame.layout import TextLayout, wrap_text
+
+
+@pytest.fixture(scope="module")
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 32)
+
+
+def test_wrap_preserves_text(font):
+    """Joining the wrapped lines with spaces gives back the sentence."""
+    text = "the quick brown fox jumps over the lazy dog again and again"
+    lines = wrap_text(text, font, 200)
+    assert len(lines) > 1
+    assert " ".join(lines) == text
+
+
+def test_positions(font):
+    """Indices map to their line and x offset, break spaces to the next line start."""
+    text = "the quick brown fox jumps over the lazy dog"
+    layout = TextLayout(text, font, 200, lambda char: font.size(char)[0])
+    first_break = len(layout.lines[0])
+    assert first_break in layout.line_breaks
+    assert layout.position(first_break) == (1, 0, layout.line_height)
+    assert layout.position(first_break + 1)[:2] == (1, 0)
+    assert layout.position(1)[1] == font.size("t")[0]
+    # End of text sits after the last character of the last line
+    last_line = len(layout.lines) - 1
+    assert layout.position(len(text))[:2] == (last_line, layout.line_widths[-1])
+    assert layout.line_and_column(first_break) == (1, 0)
+    assert layout.line_and_column(first_break + 2) == (1, 1)
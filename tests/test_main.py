@@ -0,0 +1,19 @@
+"""Tests for the command line options."""
+
+import pytest
+
+from typegame.main import parse_args
+
+
+def test_adaptive_rejected_with_model():
+    """Weak-letter weights only apply to the word-list generator."""
+    assert parse_args(["--adaptive"]).adaptive
+    with pytest.raises(SystemExit):
+        parse_args(["--adaptive", "--model", "english.tgng"])
+
+
+def test_invalid_player_rejected():
+    """Player names become file names; anything else is a usage error, before the window opens."""
+    assert parse_args(["--player", "alice-2"]).player == "alice-2"
+    with pytest.raises(SystemExit):
+        parse_args(["--player", "../alice"])
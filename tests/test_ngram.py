@@ -0,0 +1,51 @@
+"""Tests for the compiled bigram sentence model."""
+
+import random
+
+import pytest
+
+from typegame.ngram import NgramGenerator, NgramModel, train
+
+CORPUS = """The cat sat on the mat. The dog sat on the log!
+A cat and a dog ran to the park; the park was green.
+"""
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    source = tmp_path / "corpus.txt"
+    source.write_text(CORPUS * 3, encoding="utf-8")
+    path = str(tmp_path / "model.tgng")
+    train([str(source)], vocabulary_size=50).save(path)
+    return path
+
+
+def test_generated_words_follow_bigrams(model_path):
+    """Every word pair in a generated sentence is a bigram of the corpus or a new sentence start."""
+    model = NgramModel.load(model_path)
+    sentences = [[word for word in sentence.lower().split()]
+                 for sentence in CORPUS.replace("!", ".").replace(";", ".").split(".")]
+    bigrams = {pair for words in sentences for pair in zip(words, words[1:])}
+    starts = {words[0] for words in sentences if words}
+
+    generator = NgramGenerator(model, random.Random(4))
+    for sentence in generator.generate_many(200, 5, 9):
+        words = sentence.split()
+        assert 5 <= len(words) <= 9
+        assert words[0] in starts
+        assert all(pair in bigrams or pair[1] in starts for pair in zip(words, words[1:]))
+    model.close()
+
+
+def test_load_rejects_bad_files(model_path, tmp_path):
+    """Truncated or foreign files are refused."""
+    assert not list(tmp_path.glob("*.tmp"))  # Saved through a temporary file renamed into place
+    data = open(model_path, "rb").read()
+    truncated = tmp_path / "truncated.tgng"
+    truncated.write_bytes(data[:-8])
+    with pytest.raises(ValueError):
+        NgramModel.load(str(truncated))
+    foreign = tmp_path / "foreign.tgng"
+    foreign.write_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        NgramModel.load(str(foreign))
@@ -0,0 +1,23 @@
+"""Tests for the sentence prefetch queue."""
+
+from typegame.prefetch import PreparedSentence, SentencePrefetcher
+
+
+def make_prefetcher(capacity=2):
+    counter = iter(range(100))
+    return SentencePrefetcher(lambda: PreparedSentence(f"s{next(counter)}", []), capacity)
+
+
+def test_fill_respects_capacity():
+    """The queue never grows past its capacity."""
+    prefetcher = make_prefetcher()
+    assert prefetcher.fill(max_items=5) == 2
+    assert prefetcher.fill() == 0
+    assert len(prefetcher) == 2
+
+
+def test_pop_is_fifo_and_falls_back():
+    """Prefetched sentences come out in order, then are prepared on demand."""
+    prefetcher = make_prefetcher()
+    prefetcher.fill(max_items=2)
+    assert [prefetcher.pop().text for _ in range(3)] == ["s0", "s1", "s2"]
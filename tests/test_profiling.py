@@ -0,0 +1,55 @@
+"""Tests for the frame profiler."""
+
+import csv
+import json
+
+from typegame.profiling import FrameProfiler, profiled
+
+
+class Widget:
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    @profiled("paint")
+    def paint(self):
+        with self.profiler.zone("text"):
+            return 42
+
+
+def test_nested_zones_and_exports(tmp_path):
+    """Zones nest inside a frame and export as CSV rows and Chrome trace events."""
+    profiler = FrameProfiler(enabled=True, history=2)
+    widget = Widget(profiler)
+    with profiler.zone("outside"):  # Not in a frame: ignored
+        pass
+    for _ in range(3):
+        profiler.begin_frame()
+        with profiler.zone("draw"):
+            assert widget.paint() == 42
+        profiler.end_frame()
+    assert profiler.frame_count == 3 and len(profiler.frames) == 2
+    frame = profiler.last_frame
+    assert [(name, depth) for name, depth, _, _ in frame.zones] == [("draw", 0), ("paint", 1), ("text", 2)]
+    assert frame.zones[0][3] >= frame.zones[1][3] >= frame.zones[2][3]
+
+    csv_path = tmp_path / "frames.csv"
+    profiler.export(str(csv_path))
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["frame"] for row in rows] == ["1"] * 3 + ["2"] * 3
+
+    trace_path = tmp_path / "frames.json"
+    profiler.export(str(trace_path))
+    events = json.loads(trace_path.read_text(encoding="utf-8"))["traceEvents"]
+    assert [event["name"] for event in events[:4]] == ["frame", "draw", "paint", "text"]
+
+
+def test_disabled_profiler_records_nothing():
+    """A disabled profiler hands out a shared no-op zone."""
+    profiler = FrameProfiler()
+    widget = Widget(profiler)
+    profiler.begin_frame()
+    assert profiler.zone("a") is profiler.zone("b")
+    assert widget.paint() == 42
+    profiler.end_frame()
+    assert profiler.last_frame is None
@@ -0,0 +1,111 @@
+"""Tests for the results stores."""
+
+import json
+import os
+
+import pytest
+
+from typegame.results import ResultsJournal, SQLiteResultsStore, open_results_store, player_path
+
+
+def make_result(wpm):
+    return {"date": f"2025-01-01T00:00:{wpm:02d}", "wpm": wpm, "accuracy": 95.0}
+
+
+def test_append_and_tail(tmp_path):
+    """Appended results are returned by tail, oldest first."""
+    journal = ResultsJournal(str(tmp_path / "results.jsonl"))
+    for wpm in range(60):
+        journal.append(make_result(wpm))
+    assert [r["wpm"] for r in journal.tail(3)] == [57, 58, 59]
+    assert len(list(journal)) == 60
+
+
+def test_legacy_import(tmp_path):
+    """The old results.json list is migrated on first use."""
+    legacy = tmp_path / "results.json"
+    legacy.write_text(json.dumps([make_result(10), make_result(20)]))
+    journal = ResultsJournal(str(tmp_path / "results.jsonl"), legacy_path=str(legacy))
+    journal.append(make_result(30))
+    assert [r["wpm"] for r in journal.tail(10)] == [10, 20, 30]
+
+
+def test_torn_write_is_repaired(tmp_path):
+    """A partial last line is dropped instead of corrupting the next append."""
+    path = tmp_path / "results.jsonl"
+    path.write_bytes(json.dumps(make_result(10)).encode() + b'\n{"wpm": 4')
+    journal = ResultsJournal(str(path))
+    journal.append(make_result(20))
+    assert [r["wpm"] for r in journal.tail(10)] == [10, 20]
+    assert not journal.damaged
+
+
+def test_sqlite_store_queries(tmp_path):
+    """The SQLite store imports the legacy history and answers last-N queries."""
+    legacy = tmp_path / "results.json"
+    legacy.write_text(json.dumps([make_result(10), make_result(20)]))
+    store = SQLiteResultsStore(str(tmp_path / "results.db"), legacy_path=str(legacy))
+    store.append(dict(make_result(30), keystrokes="abc"))
+    assert [r["wpm"] for r in store.tail(2)] == [20, 30]
+    assert store.tail(1)[0]["keystrokes"] == "abc"
+    assert store.count() == 3
+    store.close()
+
+
+def _append_many(path, start, count, compact_every):
+    journal = ResultsJournal(path)
+    for wpm in range(start, start + count):
+        journal.append(make_result(wpm % 60))
+        if compact_every and wpm % compact_every == 0:
+            journal.compact()
+
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    """Games appending and compacting the same journal at once keep every result."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    path = str(tmp_path / "results.jsonl")
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(_append_many, path, i * 40, 40, 7 if i % 2 else 0) for i in range(4)]
+        for future in futures:
+            future.result()
+    journal = ResultsJournal(path)
+    assert len(list(journal)) == 160 and not journal.damaged
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_players_are_isolated(tmp_path):
+    """Each player has their own store; only the default one imports the shared history."""
+    legacy = tmp_path / "results.json"
+    legacy.write_text(json.dumps([make_result(10)]))
+    default = open_results_store(results_file=str(legacy))
+    alice = open_results_store(results_file=str(legacy), player="alice")
+    alice.append(make_result(20))
+    assert alice.path == str(tmp_path / "results.alice.jsonl")
+    assert [r["wpm"] for r in alice.tail(5)] == [20]
+    assert [r["wpm"] for r in default.tail(5)] == [10]
+
+    store = open_results_store(str(tmp_path / "scores.db"), str(legacy), player="bob")
+    assert store.path == str(tmp_path / "scores.bob.db") and store.count() == 0
+    store.close()
+    with pytest.raises(ValueError):
+        player_path("results.jsonl", "../other")
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_compaction_keeps_permissions(tmp_path):
+    """A rewritten journal keeps its mode; a new one gets open()'s default, not 0600."""
+    path = str(tmp_path / "results.jsonl")
+    journal = ResultsJournal(path)
+    journal.append(make_result(40))
+    os.chmod(path, 0o640)
+    journal.compact()
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+    legacy = tmp_path / "results.json"
+    legacy.write_text(json.dumps([make_result(50)]))
+    imported = str(tmp_path / "imported.jsonl")
+    list(ResultsJournal(imported, legacy_path=str(legacy)))
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(imported).st_mode & 0o777 == 0o666 & ~umask
@@ -0,0 +1,34 @@
+"""Tests for alias-table sampling and weighted sentence generation."""
+
+import random
+from collections import Counter
+
+from typegame.sampling import AliasSampler, frequency_weights, weak_letter_weights
+from typegame.sentences import SentenceGenerator
+
+
+def test_alias_sampler_follows_weights():
+    """Pick frequencies match the weights, zero weights are never picked."""
+    sampler = AliasSampler("abcd", [5, 3, 2, 0], random.Random(1))
+    counts = Counter(sampler() for _ in range(50000))
+    assert "d" not in counts
+    for item, weight in zip("abc", [5, 3, 2]):
+        assert abs(counts[item] / 50000 - weight / 10) < 0.01
+
+
+def test_weights():
+    """Zipf weights fall with rank; weak letters raise the words that contain them."""
+    assert frequency_weights(3) == [1.0, 0.5, 1 / 3]
+    assert weak_letter_weights(["cat", "dog"], [1.0, 1.0], {"o": 0.5}) == [1.0, 3.0]
+
+
+def test_generator_favours_frequent_and_weak_words():
+    """Frequent words come up more, and weak letters shift the mix once set."""
+    words = ["keyboard", "python", "typing", "zebra", "quiz"]
+    generator = SentenceGenerator(words, rng=random.Random(2))
+    counts = Counter(" ".join(generator.generate_many(500)).split())
+    assert counts["keyboard"] > counts["python"] > counts["quiz"]
+
+    generator.set_weak_letters({"z": 1.0})
+    counts = Counter(" ".join(generator.generate_many(500)).split())
+    assert counts["quiz"] > counts["python"]
@@ -0,0 +1,81 @@
+"""Tests for resolution-independent screen geometry."""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from typegame.game import Game
+from typegame.results import ResultsJournal
+from typegame.screen import playing_layout, ui_scale
+
+
+def test_playing_layout_scales_design_coordinates():
+    """At the design size the layout is the original one; a 4K window scales it."""
+    layout = playing_layout(800, 600, ui_scale(800, 600))
+    assert layout.stats_xs == (50, 200, 350, 550)
+    assert layout.stats_rect == pygame.Rect(0, 25, 800, 25)
+    assert (layout.text_x, layout.text_y, layout.text_width, layout.footer_y) == (50, 240, 700, 505)
+
+    assert ui_scale(3840, 2160) == 3.6
+    layout = playing_layout(3840, 2160, ui_scale(3840, 2160))
+    assert layout.stats_xs == (180, 720, 1260, 1980)
+    assert layout.text_width == 3840 - 360 and layout.footer_y == 2160 - 342
+
+
+def test_resize_lays_out_once_for_new_size():
+    """A resize switches fonts and layouts; returning to a size reuses its cached glyphs."""
+    pygame.display.init()
+    pygame.font.init()
+    game = Game()
+    small_atlas = game.glyph_atlas
+    game.draw()
+
+    game.screen = pygame.display.set_mode((1600, 1200), pygame.RESIZABLE)
+    game.handle_events([pygame.event.Event(pygame.VIDEORESIZE, size=(1200, 900), w=1200, h=900),
+                        pygame.event.Event(pygame.VIDEORESIZE, size=(1600, 1200), w=1600, h=1200)])
+    assert (game.width, game.height, game.scale) == (1600, 1200, 2.0)
+    layout = game.get_sentence_layout()
+    assert layout.max_width == 1400 and layout.font is game.typing_font
+    assert game.glyph_atlas is not small_atlas
+    game.draw()
+
+    game.screen = pygame.display.set_mode((800, 600), pygame.RESIZABLE)
+    game.resize(800, 600)
+    assert game.glyph_atlas is small_atlas
+    game.draw()
+
+
+def test_wrapped_passage_lines_redraw_cleanly(tmp_path):
+    """After a resize wraps the kept lines, partial redraws match a full one."""
+    pygame.display.init()
+    pygame.font.init()
+    game = Game(endless=True, width=1200, height=600)
+    game.results_store = ResultsJournal(str(tmp_path / "results.jsonl"))
+
+    def type_text(text):
+        for char in text:
+            game.handle_events([pygame.event.Event(pygame.KEYDOWN, key=0, unicode=char, mod=0)])
+            game.draw()
+
+    type_text(game.current_sentence[:10])
+    game.screen = pygame.display.set_mode((700, 600), pygame.RESIZABLE)
+    game.resize(700, 600)
+    type_text(game.current_sentence[10:] + game.current_sentence[:5])
+    previous = game.passage.previous.layout
+    assert len(previous.lines) > 1 and game.passage_band == previous.height
+    while game.scroll_offset or game.cursor_current_x != game.cursor_target_x:
+        game.draw()
+
+    game.cursor_blink_start = pygame.time.get_ticks()  # No blink between the two frames
+    game.draw()
+    partial = game.screen.copy()
+    game.damage.invalidate()
+    game.draw()
+    assert pygame.image.tobytes(partial, "RGB") == pygame.image.tobytes(game.screen, "RGB")
+    # The first row of the previous line is on screen, not clipped away
+    layout = game.playing_layout
+    first_row = pygame.Rect(layout.text_x, layout.text_y - previous.height,
+                            previous.line_widths[0], previous.font.get_height())
+    assert pygame.transform.average_color(game.screen, first_row)[:3] != game.BG_COLOR
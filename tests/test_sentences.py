@@ -0,0 +1,29 @@
+"""Tests for sentence generation."""
+
+import random
+
+from typegame.sentences import SentenceGenerator
+
+
+WORDS = ["the", "a", "you", "is", "and", "with", "python", "keyboard", "typing", "game"]
+
+
+def test_generate_uses_vocabulary():
+    """Sentences only contain known words and respect the length bounds."""
+    generator = SentenceGenerator(WORDS, rng=random.Random(1))
+    for sentence in generator.generate_many(200, 8, 15):
+        words = sentence.split(" ")
+        assert 8 <= len(words) <= 15
+        assert set(words) <= set(WORDS)
+
+
+def test_generate_is_reproducible_with_seed():
+    """The same seed produces the same batch."""
+    first = SentenceGenerator(WORDS, rng=random.Random(7)).generate_many(5)
+    second = SentenceGenerator(WORDS, rng=random.Random(7)).generate_many(5)
+    assert first == second
+
+
+def test_empty_vocabulary():
+    """An empty word list produces the placeholder sentence."""
+    assert SentenceGenerator([]).generate() == "no words available"
@@ -0,0 +1,82 @@
+"""Tests for the headless typing session and keystroke replay."""
+
+import random
+
+from typegame.session import GAME_OVER, IGNORED, SENTENCE_DONE, TYPED, TypingSession
+from typegame.simulation import BACKSPACE, read_keystrokes, replay, synthetic_typist, write_keystrokes
+
+
+def test_type_sentence_with_correction():
+    """Errors are counted, backspace fixes them and completion is detected."""
+    session = TypingSession(sentences_per_game=2)
+    session.start_sentence("ab")
+    assert session.type_char("x", 0) == TYPED
+    assert session.errors == 1
+    assert session.backspace()
+    assert session.type_char("a", 100) == TYPED
+    assert session.type_char("1", 150) == IGNORED
+    assert session.type_char("", 160) == IGNORED  # Shift and other keys without text
+    assert session.type_char("b", 200) == SENTENCE_DONE
+    session.start_sentence("c")
+    assert session.type_char("c", 300) == GAME_OVER
+    assert session.total_characters_typed == 4
+
+
+
+def test_game_started_at_tick_zero():
+    """A first keystroke at tick 0 still starts the timer."""
+    session = TypingSession()
+    session.start_sentence("abcde")
+    for char in "abcde":
+        session.type_char(char, 0)
+    session.calculate_stats(60000)
+    assert session.start_time == 0
+    assert session.wpm == 1 and session.accuracy == 100
+
+
+def test_incremental_mismatch_tracking():
+    """The mismatch count and correctness bitmap follow typing and backspaces."""
+    session = TypingSession()
+    session.start_sentence("abc")
+    session.type_char("a", 0)
+    session.type_char("x", 10)
+    session.type_char("c", 20)
+    assert session.mismatches == 1 and not session.sentence_complete
+    assert session.is_correct(0) and not session.is_correct(1)
+    session.backspace()
+    session.backspace()
+    assert session.mismatches == 0 and session.typed_text == "a"
+    session.type_char("b", 30)
+    assert session.type_char("c", 40) == SENTENCE_DONE
+
+
+def test_time_limit_ends_game():
+    """A keystroke after the time limit ends the game."""
+    session = TypingSession(time_limit_ms=1000)
+    session.start_sentence("abc")
+    session.type_char("a", 0)
+    assert session.type_char("b", 1500) == GAME_OVER
+
+
+def test_replay_synthetic_stream(tmp_path):
+    """A recorded synthetic stream replays to the same games and sentences."""
+    sentences = ["the quick fox", "jumps over", "the lazy dog"] * 10
+    stream = []
+
+    def recording(keystrokes):
+        for keystroke in keystrokes:
+            stream.append(keystroke)
+            yield keystroke
+
+    it = iter(sentences)
+    session = TypingSession()
+    session.start_sentence(next(it))
+    first = replay(recording(synthetic_typist(session, rng=random.Random(3), error_rate=0.1)),
+                   lambda: next(it), session=session, restart=False)
+    assert first.games == 1 and first.sentences == 3
+    assert BACKSPACE in [char for _, char in stream]
+
+    path = str(tmp_path / "keys.jsonl")
+    write_keystrokes(path, stream)
+    it = iter(sentences)
+    assert replay(read_keystrokes(path), lambda: next(it), restart=False) == first
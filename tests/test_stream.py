@@ -0,0 +1,85 @@
+"""Tests for streamed long passages."""
+
+import itertools
+
+import pygame
+import pytest
+
+from typegame.session import SENTENCE_DONE, TypingSession
+from typegame.stream import PassageWindow, clean_word, file_words
+
+
+@pytest.fixture(scope="module")
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 32)
+
+
+def glyph_width(font):
+    return lambda char: font.size(char)[0]
+
+
+def test_file_words(tmp_path):
+    """Words are lowercased and stripped of characters that cannot be typed."""
+    path = tmp_path / "text.txt"
+    path.write_text("Don't stop 42 times,\n\nplease!\n", encoding="utf-8")
+    assert list(file_words(str(path))) == ["dont", "stop", "times,", "please!"]
+    assert clean_word("123") == ""
+
+
+def test_window_reads_lazily(font):
+    """An endless word stream is only consumed as far as the window needs."""
+    consumed = []
+
+    def words():
+        for i in itertools.count():
+            consumed.append(i)
+            yield "word"
+
+    window = PassageWindow(words(), font, 300, glyph_width(font), lookahead=3)
+    first = window.next_line()
+    assert len(window.upcoming()) == 3
+    read = len(consumed)
+    for _ in range(100):
+        window.next_line()
+    assert window.previous is not None and len(window.upcoming()) == 3
+    # Constant work per line: about as many words per line as at the start
+    assert len(consumed) < read * 30
+    assert first.layout.text.endswith(" ")
+    assert len(first.layout.lines) == 1 and first.layout.line_widths[0] <= 300
+
+
+def test_passage_typed_to_the_end(font):
+    """Typing every line, trailing spaces included, reaches the end of the passage."""
+    words = ("alpha beta gamma delta epsilon " * 20).split()
+    window = PassageWindow(words, font, 250, glyph_width(font))
+    session = TypingSession(sentences_per_game=None, time_limit_ms=None)
+    typed = []
+    line = window.next_line()
+    while line is not None:
+        session.start_sentence(line.layout.text)
+        outcomes = [session.type_char(char, 10 ** 9) for char in line.layout.text]
+        assert outcomes[-1] == SENTENCE_DONE
+        typed.append(line.layout.text)
+        line = window.next_line()
+    assert "".join(typed) == " ".join(words)
+    assert session.score == len(typed) == window.lines_read
+
+
+def test_relayout_keeps_text(font):
+    """Re-wrapping for a narrower window keeps the current line and every word."""
+    words = ("alpha beta gamma delta epsilon " * 10).split()
+    window = PassageWindow(words, font, 400, glyph_width(font), lookahead=2)
+    window.next_line()
+    current = window.next_line().layout.text
+    small = pygame.font.Font(None, 24)
+    window.relayout(small, 200, glyph_width(small), line_spacing=5)
+    assert window.current.layout.text == current and window.current.layout.font is small
+    # The kept line wraps: drawing stacks lines by their real height
+    layout = window.current.layout
+    assert len(layout.lines) > 1 and layout.height == len(layout.lines) * layout.line_height
+    assert all(line.layout.max_width == 200 for line in window.upcoming())
+    typed = [window.previous.layout.text, current]
+    while window.next_line() is not None:
+        typed.append(window.current.layout.text)
+    assert "".join(typed) == " ".join(words)
@@ -0,0 +1,63 @@
+"""Tests for the offscreen sentence surface."""
+
+import random
+
+import pygame
+import pytest
+
+from typegame.glyphs import GlyphAtlas
+from typegame.layout import TextLayout
+from typegame.session import TYPED, TypingSession
+from typegame.textsurface import SentenceSurface, TypingColors, line_surface
+
+COLORS = TypingColors((20, 20, 20), (100, 100, 100), (240, 240, 240), (220, 40, 40), (240, 200, 0))
+
+
+@pytest.fixture(scope="module")
+def atlas():
+    pygame.font.init()
+    return GlyphAtlas(pygame.font.Font(None, 32))
+
+
+@pytest.mark.parametrize("margin, border", [(SentenceSurface.MARGIN, SentenceSurface.BORDER), (72, 7)])
+def test_patches_match_full_render(atlas, margin, border):
+    """After every keystroke the patched surface equals a fresh render, line-break errors included.
+
+    Also at a large UI scale, where the marker margin and border are wider.
+    """
+    text = "the quick brown fox jumps over the lazy dog again and again"
+    layout = TextLayout(text, atlas.font, 200, atlas.width)
+    assert layout.line_breaks
+    session = TypingSession()
+    session.start_sentence(text)
+    patched = SentenceSurface(layout, atlas, COLORS, margin, border)
+    patched.render(session)
+    fresh = SentenceSurface(layout, atlas, COLORS, margin, border)
+    assert patched.surface.get_width() == margin + 200 + patched.cell_extent
+
+    rng = random.Random(5)
+    for _ in range(150):
+        count = session.typed_count
+        if count == len(text) or (count and rng.random() < 0.25):
+            session.backspace()
+            patched.patch(session, count - 1, count + 1)
+        else:
+            # Mistype often, with wide letters, so error glyphs overlap their neighbours
+            char = rng.choice("mw") if rng.random() < 0.3 else text[count]
+            if session.type_char(char, 0) != TYPED:
+                break
+            patched.patch(session, count, count + 2)
+        fresh.render(session)
+        assert pygame.image.tobytes(patched.surface, "RGB") == pygame.image.tobytes(fresh.surface, "RGB")
+
+
+def test_line_surface_keeps_wrapped_rows(atlas):
+    """A line wrapped over several rows is drawn with all of them."""
+    layout = TextLayout("the quick brown fox jumps over ", atlas.font, 150, atlas.width, line_spacing=6)
+    surface = line_surface(layout, atlas, (255, 255, 255), (0, 0, 0))
+    rows = len(layout.lines)
+    assert rows > 1
+    assert surface.get_height() == rows * layout.line_height - 6
+    # Something is drawn on the last row
+    last_row = pygame.Rect(0, layout.line_height * (rows - 1), surface.get_width(), atlas.font.get_height())
+    assert pygame.transform.average_color(surface, last_row)[:3] != (0, 0, 0)
@@ -0,0 +1,61 @@
+"""Tests for the widget hit-test registry."""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from typegame.game import Game
+from typegame.results import ResultsJournal
+from typegame.widgets import HitGrid, Widget, WidgetRegistry
+
+
+def test_grid_lookup_replace_and_overlap():
+    """Widgets spanning cells are found anywhere inside; re-registering moves them."""
+    grid = HitGrid(cell_size=10)
+    clicked = []
+    grid.add(Widget("wide", pygame.Rect(5, 5, 40, 10), lambda: clicked.append("wide")))
+    grid.add(Widget("top", pygame.Rect(20, 0, 10, 30), lambda: clicked.append("top")))
+    assert grid.hit((6, 6)).name == "wide"
+    assert grid.hit((25, 8)).name == "top"  # Registered last: drawn on top
+    assert grid.hit((25, 25)).name == "top"
+    assert grid.hit((60, 60)) is None
+    grid.hit((44, 14)).action()
+    assert clicked == ["wide"]
+
+    grid.add(Widget("wide", pygame.Rect(100, 100, 10, 10), grid.widgets["wide"].action))
+    assert grid.hit((6, 6)) is None and grid.hit((105, 105)).name == "wide"
+    grid.remove("top")
+    assert grid.hit((25, 25)) is None and len(grid.widgets) == 1
+
+
+def test_registry_is_per_state():
+    """Only the widgets of the queried state are hit."""
+    registry = WidgetRegistry()
+    registry.register("playing", "theme", (0, 0, 50, 50), lambda: None)
+    assert registry.hit("playing", (10, 10)).name == "theme"
+    assert registry.hit("finished", (10, 10)) is None
+    registry.unregister("playing", "theme")
+    assert registry.get("playing", "theme") is None
+
+
+def test_results_buttons_hover_and_click(tmp_path):
+    """A burst of motion events resolves hover once; clicks run the button action."""
+    pygame.display.init()
+    pygame.font.init()
+    game = Game()
+    game.results_store = ResultsJournal(str(tmp_path / "results.jsonl"))
+    game.finish_game()
+    game.draw()
+
+    quit_rect = game.widgets.get("finished", "quit").rect
+    motion = [pygame.event.Event(pygame.MOUSEMOTION, pos=(x, 5), rel=(1, 0), buttons=(0, 0, 0))
+              for x in range(200)]
+    motion.append(pygame.event.Event(pygame.MOUSEMOTION, pos=quit_rect.center, rel=(0, 0), buttons=(0, 0, 0)))
+    game.handle_events(motion)
+    assert game.hover_button == "quit"
+
+    click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=quit_rect.center, button=1)
+    game.handle_events([click])
+    assert not game.running
@@ -0,0 +1,34 @@
+"""Tests for compiled word packs."""
+
+from typegame import wordpack
+
+
+def test_pack_round_trip(tmp_path):
+    """Words written to a pack are read back unchanged."""
+    path = str(tmp_path / "words.pack")
+    wordpack.write_pack(path, ["the", "quick", "fox"], key="k1")
+    assert wordpack.read_pack(path, "k1") == ["the", "quick", "fox"]
+
+
+def test_pack_rejects_stale_key(tmp_path):
+    """A pack written for another source or filter is ignored."""
+    path = str(tmp_path / "words.pack")
+    wordpack.write_pack(path, ["word"], key="old")
+    assert wordpack.read_pack(path, "new") is None
+    assert wordpack.read_pack(str(tmp_path / "missing.pack")) is None
+
+
+def test_source_key_tracks_params(tmp_path):
+    """Changing the filter parameters changes the key."""
+    source = tmp_path / "words.csv"
+    source.write_text("word\nthe\n")
+    assert wordpack.source_key(str(source), limit=10) != wordpack.source_key(str(source), limit=20)
+
+
+def test_write_leaves_no_temporary_file(tmp_path):
+    """Packs are written through a private temporary file renamed into place."""
+    path = str(tmp_path / "words.pack")
+    wordpack.write_pack(path, ["one"], key="k")
+    wordpack.write_pack(path, ["two"], key="k")
+    assert wordpack.read_pack(path, "k") == ["two"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["words.pack"]
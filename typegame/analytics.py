@@ -0,0 +1,155 @@
+"""Vectorized analytics over results history and keystroke logs.
+
+Run ``python -m typegame.analytics`` for a report on the stored history.
+"""
+
+import argparse
+import base64
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .keylog import BACKSPACE
+from .results import open_results_store
+
+# Inter-key gaps longer than this are pauses, not typing rhythm
+PAUSE_MS = 2000
+
+
+def history_arrays(results: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(wpm, accuracy) arrays for a sequence of results, oldest first."""
+    wpm = np.fromiter((r.get('wpm', 0) for r in results), dtype=np.float64, count=len(results))
+    accuracy = np.fromiter((r.get('accuracy', 0) for r in results), dtype=np.float64, count=len(results))
+    return wpm, accuracy
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` values (fewer at the start), via cumulative sums."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return values
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    end = np.arange(1, values.size + 1)
+    start = np.maximum(end - window, 0)
+    return (sums[end] - sums[start]) / (end - start)
+
+
+def percentiles(values: np.ndarray, q: Sequence[float] = (25, 50, 75, 90)) -> Dict[float, float]:
+    """Requested percentiles of values (empty dict for no data)."""
+    if len(values) == 0:
+        return {}
+    return dict(zip(q, np.percentile(values, q).tolist()))
+
+
+def trend(values: np.ndarray) -> Tuple[float, float]:
+    """Least-squares line (slope per game, intercept) through values."""
+    if len(values) < 2:
+        return 0.0, float(values[0]) if len(values) else 0.0
+    slope, intercept = np.polyfit(np.arange(len(values), dtype=np.float64), values, 1)
+    return float(slope), float(intercept)
+
+
+def keystroke_arrays(results: Iterable[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenated (deltas ms, expected code points, typed code points) of all logged keystrokes."""
+    deltas, expected, typed = [], [], []
+    for result in results:
+        log = result.get('keystrokes')
+        if not log:
+            continue
+        deltas.append(np.frombuffer(base64.b64decode(log['deltas']), dtype='<u4'))
+        expected.append(np.frombuffer(log['expected'].encode('utf-32-le'), dtype='<u4'))
+        typed.append(np.frombuffer(log['typed'].encode('utf-32-le'), dtype='<u4'))
+    if not deltas:
+        empty = np.zeros(0, dtype=np.uint32)
+        return empty, empty, empty
+    return np.concatenate(deltas), np.concatenate(expected), np.concatenate(typed)
+
+
+def consistency(deltas: np.ndarray) -> Tuple[float, float, float]:
+    """(mean, standard deviation, coefficient of variation) of inter-key intervals.
+
+    The first key of a session (delta 0) and pauses longer than PAUSE_MS are
+    left out; a lower deviation means a steadier rhythm.
+    """
+    intervals = deltas[(deltas > 0) & (deltas <= PAUSE_MS)].astype(np.float64)
+    if intervals.size == 0:
+        return 0.0, 0.0, 0.0
+    mean = float(intervals.mean())
+    std = float(intervals.std())
+    return mean, std, std / mean
+
+
+def error_heatmap(expected: np.ndarray, typed: np.ndarray) -> Dict[str, Tuple[int, int]]:
+    """Per expected character: (attempts, errors), backspaces excluded."""
+    keys = (expected != 0) & (typed != ord(BACKSPACE))
+    expected = expected[keys]
+    if expected.size == 0:
+        return {}
+    chars, inverse = np.unique(expected, return_inverse=True)
+    attempts = np.bincount(inverse, minlength=chars.size)
+    errors = np.bincount(inverse, weights=(expected != typed[keys]), minlength=chars.size)
+    return {chr(c): (int(a), int(e)) for c, a, e in zip(chars.tolist(), attempts, errors)}
+
+
+def summarize(results: Sequence[Dict[str, Any]], window: int = 10) -> Dict[str, Any]:
+    """All history and keystroke metrics for a list of results."""
+    wpm, accuracy = history_arrays(results)
+    deltas, expected, typed = keystroke_arrays(results)
+    mean_interval, interval_std, interval_cv = consistency(deltas)
+    slope, _ = trend(wpm)
+    return {
+        "sessions": len(results),
+        "wpm_best": float(wpm.max()) if wpm.size else 0.0,
+        "wpm_rolling": float(rolling_mean(wpm, window)[-1]) if wpm.size else 0.0,
+        "accuracy_rolling": float(rolling_mean(accuracy, window)[-1]) if accuracy.size else 0.0,
+        "wpm_percentiles": percentiles(wpm),
+        "wpm_trend": slope,
+        "keystrokes": int(deltas.size),
+        "interval_mean": mean_interval,
+        "interval_std": interval_std,
+        "interval_cv": interval_cv,
+        "errors_by_char": error_heatmap(expected, typed),
+    }
+
+
+def format_report(summary: Dict[str, Any], top: int = 5) -> List[str]:
+    """Human-readable report lines for a summary."""
+    lines = [
+        f"Parties: {summary['sessions']}",
+        f"WPM record: {summary['wpm_best']:.0f} | moyenne glissante: {summary['wpm_rolling']:.1f} "
+        f"| tendance: {summary['wpm_trend']:+.2f}/partie",
+        "WPM percentiles: " + ", ".join(f"p{q:g}={v:.0f}" for q, v in summary['wpm_percentiles'].items()),
+        f"Précision glissante: {summary['accuracy_rolling']:.1f}%",
+        f"Frappes enregistrées: {summary['keystrokes']:,}",
+    ]
+    if summary['keystrokes']:
+        lines.append(f"Régularité: {summary['interval_mean']:.0f} ms ± {summary['interval_std']:.0f} ms "
+                     f"(cv {summary['interval_cv']:.2f})")
+        rates = [(errors / attempts, char, attempts) for char, (attempts, errors) in
+                 summary['errors_by_char'].items() if errors]
+        worst = sorted(rates, reverse=True)[:top]
+        if worst:
+            lines.append("Touches à travailler: " + ", ".join(
+                f"'{char}' {rate * 100:.0f}% ({attempts})" for rate, char, attempts in worst))
+    return lines
+
+
+def main(argv=None):
+    """Print an analytics report for the stored results."""
+    parser = argparse.ArgumentParser(prog="python -m typegame.analytics",
+                                     description="TypeGame history report")
+    parser.add_argument("--results-db", metavar="PATH", help="read results from an SQLite database")
+    parser.add_argument("--player", metavar="NAME", help="report on this player's history")
+    parser.add_argument("--window", type=int, default=10, help="rolling average window (default: 10)")
+    args = parser.parse_args(argv)
+
+    try:
+        results = list(open_results_store(args.results_db, player=args.player))
+    except ValueError as e:
+        parser.error(str(e))
+    for line in format_report(summarize(results, args.window)):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
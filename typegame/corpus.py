@@ -0,0 +1,205 @@
+"""Corpus pipeline: filter large text or word-list files into a ranked word pack.
+
+Run ``python -m typegame.corpus SOURCE... -o words.pack`` and start the game
+with ``--words words.pack``.
+"""
+
+import argparse
+import heapq
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from . import wordpack
+
+# Lines per chunk handed to a worker
+CHUNK_LINES = 50000
+
+# Runs of letters (any script): digits, underscores and punctuation split words
+_LETTERS = re.compile(r"[^\W\d_]+")
+# camelCase and HTTPServer-style boundaries inside identifiers
+_CASE_BOUNDARY = re.compile(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+# A word-list row with a frequency column: "word,1234" or "word<TAB>1234". Only
+# one token before the separator, so prose ending in "..., 3,000" is not a row
+_COUNT_COLUMN = re.compile(r"^\s*([^\s,]+)[,\t]\s*(\d+)\s*$")
+
+# word -> (occurrences, (line, token) where first seen)
+Counts = Dict[str, Tuple[int, Tuple[int, int]]]
+
+
+class CorpusFilter(NamedTuple):
+    """Filter stages applied to every candidate word, in order.
+
+    The defaults follow the game's own word filter. A plain tuple of options,
+    so it can be sent to worker processes; the stages are built where they
+    run.
+    """
+    min_len: int = 3
+    max_len: int = 8
+    max_run: int = 2             # Longest run of one repeated letter
+    rare_letters: str = "xzqj"
+    max_rare: int = 1            # Occurrences allowed of each rare letter
+    require_vowel: bool = True
+    include: Optional[str] = None  # Regex words must match
+    exclude: Optional[str] = None  # Regex words must not match
+    split_case: bool = False     # Split camelCase identifiers into words
+
+    def stages(self) -> List[Callable[[str], bool]]:
+        """Predicates a word must pass, cheapest first."""
+        stages = [lambda word: self.min_len <= len(word) <= self.max_len]
+        if self.rare_letters:
+            stages.append(lambda word: all(word.count(char) <= self.max_rare for char in self.rare_letters))
+        if self.max_run:
+            too_long_run = re.compile(r"(.)\1{%d}" % self.max_run)
+            stages.append(lambda word: not too_long_run.search(word))
+        if self.require_vowel:
+            stages.append(lambda word: any(char in 'aeiou' for char in word))
+        if self.include:
+            include = re.compile(self.include)
+            stages.append(lambda word: include.search(word) is not None)
+        if self.exclude:
+            exclude = re.compile(self.exclude)
+            stages.append(lambda word: exclude.search(word) is None)
+        return stages
+
+
+def tokenize(line: str, split_case: bool = False) -> Tuple[List[str], int]:
+    """Lowercase words of a line and the weight of each occurrence.
+
+    Word lists with a frequency column weigh their word by that count; any
+    other line counts each word once.
+    """
+    weight = 1
+    match = _COUNT_COLUMN.match(line)
+    if match:
+        line, weight = match.group(1), int(match.group(2))
+    tokens = _LETTERS.findall(line)
+    if split_case:
+        tokens = [part for token in tokens for part in _CASE_BOUNDARY.split(token)]
+    return [token.lower() for token in tokens], weight
+
+
+def count_chunk(offset: int, lines: Sequence[str], corpus_filter: CorpusFilter) -> Counts:
+    """Count the words of a chunk of lines that pass every filter stage."""
+    stages = corpus_filter.stages()
+    rejected = set()
+    counts: Counts = {}
+    for line_number, line in enumerate(lines, offset):
+        tokens, weight = tokenize(line, corpus_filter.split_case)
+        for token_number, word in enumerate(tokens):
+            entry = counts.get(word)
+            if entry is not None:
+                counts[word] = (entry[0] + weight, entry[1])
+            elif word not in rejected:
+                if all(stage(word) for stage in stages):
+                    counts[word] = (weight, (line_number, token_number))
+                else:
+                    rejected.add(word)
+    return counts
+
+
+def read_chunks(paths: Iterable[str], chunk_lines: int = CHUNK_LINES) -> Iterator[Tuple[int, List[str]]]:
+    """(first line number, lines) chunks of the sources, read as they are needed."""
+    offset = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            while True:
+                lines = list(islice(f, chunk_lines))
+                if not lines:
+                    break
+                yield offset, lines
+                offset += len(lines)
+
+
+def merge_counts(total: Counts, counts: Counts):
+    """Add chunk counts into the running totals."""
+    for word, (count, first) in counts.items():
+        entry = total.get(word)
+        total[word] = (count, first) if entry is None else (entry[0] + count, min(entry[1], first))
+
+
+def count_words(paths: Sequence[str], corpus_filter: CorpusFilter = CorpusFilter(), jobs: int = 1,
+                chunk_lines: int = CHUNK_LINES) -> Counts:
+    """Count filtered words over all sources, in worker processes when jobs > 1.
+
+    Chunks are read lazily and at most two per worker are in flight, so
+    memory stays bounded whatever the corpus size.
+    """
+    total: Counts = {}
+    chunks = read_chunks(paths, chunk_lines)
+    if jobs <= 1:
+        for offset, lines in chunks:
+            merge_counts(total, count_chunk(offset, lines, corpus_filter))
+        return total
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for offset, lines in chunks:
+            pending.append(pool.submit(count_chunk, offset, lines, corpus_filter))
+            if len(pending) >= 2 * jobs:
+                merge_counts(total, pending.popleft().result())
+        while pending:
+            merge_counts(total, pending.popleft().result())
+    return total
+
+
+def rank_words(counts: Counts, limit: int) -> List[str]:
+    """The ``limit`` most frequent words; ties keep the order of first appearance."""
+    return heapq.nsmallest(limit, counts, key=lambda word: (-counts[word][0], counts[word][1]))
+
+
+def build_pack(paths: Sequence[str], output: str, corpus_filter: CorpusFilter = CorpusFilter(),
+               limit: int = 5000, jobs: int = 1, chunk_lines: int = CHUNK_LINES) -> List[str]:
+    """Filter and rank the sources, write the words to a pack and return them."""
+    words = rank_words(count_words(paths, corpus_filter, jobs, chunk_lines), limit)
+    key = ";".join([f"sources={','.join(os.path.basename(p) for p in paths)}", f"limit={limit}"]
+                   + [f"{name}={value}" for name, value in corpus_filter._asdict().items()])
+    wordpack.write_pack(output, words, key)
+    return words
+
+
+def main(argv=None):
+    """Build a word pack from corpus files."""
+    defaults = CorpusFilter()
+    parser = argparse.ArgumentParser(prog="python -m typegame.corpus",
+                                     description="Build a TypeGame word pack from text or word-list files")
+    parser.add_argument("sources", nargs="+", metavar="SOURCE",
+                        help="text files or word lists (optionally with a count column)")
+    parser.add_argument("-o", "--output", required=True, metavar="PACK", help="word pack to write")
+    parser.add_argument("--limit", type=int, default=5000, help="number of words kept (default: 5000)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="worker processes, 0 for one per core (default: 1)")
+    parser.add_argument("--chunk-lines", type=int, default=CHUNK_LINES,
+                        help=f"lines per chunk (default: {CHUNK_LINES})")
+    parser.add_argument("--min-len", type=int, default=defaults.min_len)
+    parser.add_argument("--max-len", type=int, default=defaults.max_len)
+    parser.add_argument("--max-run", type=int, default=defaults.max_run,
+                        help="longest run of a repeated letter, 0 for no limit")
+    parser.add_argument("--rare-letters", default=defaults.rare_letters,
+                        help="letters allowed at most --max-rare times per word")
+    parser.add_argument("--max-rare", type=int, default=defaults.max_rare)
+    parser.add_argument("--no-vowel-check", action="store_true",
+                        help="keep words without a vowel (other languages, identifiers)")
+    parser.add_argument("--include", metavar="REGEX", help="keep only words matching REGEX")
+    parser.add_argument("--exclude", metavar="REGEX", help="drop words matching REGEX")
+    parser.add_argument("--split-case", action="store_true",
+                        help="split camelCase identifiers into words")
+    args = parser.parse_args(argv)
+
+    corpus_filter = CorpusFilter(args.min_len, args.max_len, args.max_run, args.rare_letters,
+                                 args.max_rare, not args.no_vowel_check, args.include,
+                                 args.exclude, args.split_case)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    try:
+        words = build_pack(args.sources, args.output, corpus_filter, args.limit, jobs, args.chunk_lines)
+    except OSError as e:
+        sys.exit(f"Error: {e}")
+    print(f"{len(words):,} words written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Damage tracking: redraw and present only the screen regions that changed."""
+
+from typing import Any, Dict, List
+
+import pygame
+
+
+class DamageTracker:
+    """Remembers what each UI region last showed and collects dirty rects.
+
+    Every region is drawn under a name with a key describing its content. When
+    the key is unchanged since the last frame the region is skipped. Otherwise
+    its rect goes to the dirty list pushed by ``present()``.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, Any] = {}
+        self._rects: List[pygame.Rect] = []
+        self._full = True
+
+    def invalidate(self):
+        """Force every region to redraw and the whole screen to be flipped."""
+        self._full = True
+        self._keys.clear()
+
+    @property
+    def full_redraw(self) -> bool:
+        """True when the current frame repaints the whole screen."""
+        return self._full
+
+    def check(self, name: str, rect, key: Any) -> bool:
+        """Return True if the region must be redrawn this frame, marking it dirty."""
+        if not self._full and name in self._keys and self._keys[name] == key:
+            return False
+        self._keys[name] = key
+        self._rects.append(pygame.Rect(rect))
+        return True
+
+    def present(self):
+        """Push this frame's damage to the display."""
+        if self._full:
+            pygame.display.flip()
+        elif self._rects:
+            pygame.display.update(self._rects)
+        self._rects = []
+        self._full = False
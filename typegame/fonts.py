@@ -0,0 +1,44 @@
+"""Shared font registry and rendered-label cache."""
+
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+Color = Tuple[int, int, int]
+
+
+class FontRegistry:
+    """Fonts keyed by (face, size), loaded on first use and shared by all draw code.
+
+    ``face`` is None for pygame's default font or a system font name. The
+    registry also caches rendered static labels; ``clear_labels()`` drops them
+    when the theme changes.
+    """
+
+    def __init__(self):
+        self._fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+        self._labels: Dict[Tuple[Optional[str], int, str, Color], pygame.Surface] = {}
+
+    def get(self, face: Optional[str], size: int) -> pygame.font.Font:
+        """Return the font for (face, size), loading it the first time."""
+        key = (face, size)
+        font = self._fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(None, size) if face is None else pygame.font.SysFont(face, size)
+            self._fonts[key] = font
+        return font
+
+    def label(self, text: str, size: int, color: Color, face: Optional[str] = None) -> pygame.Surface:
+        """Render a static label once and reuse the surface."""
+        key = (face, size, text, color)
+        surface = self._labels.get(key)
+        if surface is None:
+            surface = self.get(face, size).render(text, True, color)
+            self._labels[key] = surface
+        return surface
+
+    def clear_labels(self):
+        """Drop rendered labels (theme change)."""
+        self._labels.clear()
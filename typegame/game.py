@@ -1,26 +1,114 @@
 """Main game class for TypeGame."""
 
 import pygame
-import random
-import csv
 import os
-import json
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Callable, Optional
+
+from . import wordpack
+from .damage import DamageTracker
+from .fonts import FontRegistry
+from .glyphs import GlyphAtlas
+from .latency import LatencyTracker
+from .layout import TextLayout, wrap_text
+from .ngram import NgramGenerator, NgramModel
+from .prefetch import PreparedSentence, SentencePrefetcher
+from .profiling import FrameProfiler, StartupProfiler, profiled
+from .results import DEFAULT_RESULTS_FILE, open_results_store
+from .screen import playing_layout, scaled, ui_scale
+from .sentences import SentenceGenerator
+from .session import GAME_OVER, IGNORED, SENTENCE_DONE, TYPED, TypingSession
+from .stream import PassageLine, PassageWindow, file_words, generated_words
+from .textsurface import SentenceSurface, TypingColors, line_surface
+from .widgets import WidgetRegistry
+
+# Bump when the filter rules or built-in word lists change to invalidate word packs
+WORD_FILTER_VERSION = 2
+
+# Bundled word list, and the filtered words compiled from it on first launch
+WORDS_CSV = os.path.join(os.path.dirname(__file__), '..', 'assets', 'words', 'words.csv')
+WORDS_CACHE = os.path.join(os.path.dirname(WORDS_CSV), 'words.pack')
+
+# Common English words for better sentence construction
+COMMON_WORD_CATEGORIES = {
+    "articles": ["the", "a", "an"],
+    "pronouns": ["i", "you", "he", "she", "it", "we", "they", "this", "that"],
+    "verbs": ["is", "are", "was", "were", "have", "has", "had", "do", "does", "did", "can", "will", "would", "could", "should", "make", "get", "go", "come", "see", "know", "take", "think", "feel", "work", "play", "run", "walk", "talk", "look", "find", "give", "tell", "ask", "need", "want", "help", "try", "show", "move", "live", "write", "read", "learn", "teach", "study"],
+    "prepositions": ["in", "on", "at", "by", "for", "with", "from", "to", "of", "about", "over", "under", "through", "between", "during", "before", "after"],
+    "adjectives": ["good", "bad", "big", "small", "new", "old", "high", "low", "long", "short", "hot", "cold", "fast", "slow", "easy", "hard", "light", "dark", "clean", "dirty", "safe", "dangerous", "happy", "sad", "angry", "calm", "busy", "free", "rich", "poor", "strong", "weak"],
+    "nouns": ["time", "person", "place", "thing", "way", "day", "man", "woman", "child", "life", "world", "school", "work", "home", "family", "friend", "book", "music", "movie", "game", "food", "water", "money", "car", "house", "phone", "computer", "hand", "eye", "head", "body", "word", "problem", "question", "answer", "idea", "story", "job", "business", "service", "party", "meeting"]
+}
+
+# Built-in vocabulary, also used until the CSV words are loaded
+BUILTIN_WORDS = list(dict.fromkeys(word for category in COMMON_WORD_CATEGORIES.values() for word in category))
+
+# Time between cursor blinks
+CURSOR_BLINK_MS = 530
+
+# Number of recent results kept in memory: the largest history graph draws 20
+HISTORY_WINDOW = 20
+
+# Posted by the background word loader to wake the game loop
+WORDS_LOADED_EVENT = pygame.USEREVENT + 1
+
+# Flame bar: one row per zone nesting level, colors given to zones in order
+FLAME_ROW_HEIGHT = 6
+FLAME_ROWS = 3
+FLAME_COLORS = [(66, 133, 244), (219, 68, 55), (244, 180, 0), (15, 157, 88),
+                (171, 71, 188), (0, 172, 193), (255, 112, 67), (158, 157, 36)]
 
 
 class Game:
     """Main game class that handles the typing game logic."""
     
-    def __init__(self, width: int = 800, height: int = 600):
-        """Initialize the game."""
+    def __init__(self, width: int = 800, height: int = 600, results_db: Optional[str] = None,
+                 fps: int = 60, background_loading: bool = False,
+                 startup: Optional[StartupProfiler] = None, endless: bool = False,
+                 text_file: Optional[str] = None, words_pack: Optional[str] = None,
+                 adaptive: bool = False, model: Optional[str] = None,
+                 profiler: Optional[FrameProfiler] = None, fullscreen: bool = False,
+                 player: Optional[str] = None):
+        """Initialize the game.
+        
+        results_db: path of an SQLite results database to use instead of the
+        default JSON Lines journal.
+        fps: frame cap while something is animating (0 for uncapped).
+        background_loading: load the CSV words on a worker thread and start
+        with the built-in words, so the first frame is not delayed.
+        startup: profiler recording the time spent in each startup phase.
+        endless: type an endless passage from the sentence generator instead
+        of three sentences in 60 seconds.
+        text_file: type the whole passage of a text file (implies streaming).
+        words_pack: word pack built by ``python -m typegame.corpus`` to use
+        instead of the bundled word list.
+        adaptive: after each game, favour words with the letters mistyped most.
+        model: sentence model trained with ``python -m typegame.ngram``; its
+        sentences replace the word-list generator.
+        profiler: frame profiler timing the loop and draw sections; F4 shows
+        its flame bar (and enables it while shown).
+        fullscreen: start fullscreen at the desktop resolution (F11 toggles).
+        The window is resizable; screens are laid out for width x height and
+        scaled from there.
+        player: player whose separate results history is used
+        (None for the shared default history).
+        """
+        self.startup = startup if startup is not None else StartupProfiler()
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        self.profiling_requested = self.profiler.enabled
+        self.show_flame_bar = False
+        self.flame_colors: Dict[str, Tuple[int, int, int]] = {}
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("TypeGame")
+        self.windowed_size = (width, height)
+        self.fullscreen = fullscreen
+        with self.startup.phase("window"):
+            self.screen = self.set_display_mode()
+            pygame.display.set_caption("TypeGame" if player is None else f"TypeGame - {player}")
         
         self.clock = pygame.time.Clock()
+        self.fps = fps
         self.running = True
         
         # Theme system
@@ -138,11 +226,23 @@ class Game:
             }
         }
         
-        # Apply initial theme
+        # Dirty-rect rendering: only changed regions are redrawn and pushed
+        self.damage = DamageTracker()
+        self.drawn_state = None
+        
+        # Key-to-screen latency, always measured; F3 shows the percentiles
+        self.latency = LatencyTracker()
+        self.show_latency = False
+        
+        # Fonts and static labels are cached here and shared by all draw methods
+        self.fonts = FontRegistry()
+        
+        # Apply initial theme (glyph atlases are created with the fonts, one per size)
+        self.glyph_atlases: Dict[int, GlyphAtlas] = {}
         self.apply_theme()
         
         # Animation properties
-        self.cursor_blink_time = 0
+        self.cursor_blink_start = 0  # Ticks of the last blink or keystroke
         self.cursor_visible = True
         self.cursor_target_x = 0
         self.cursor_current_x = 0
@@ -152,70 +252,181 @@ class Game:
         self.show_detailed_stats = False
         self.hover_button = None
         
-        # Initialize button rectangles
-        self.restart_button = None
-        self.details_button = None
-        self.theme_button = None
-        self.quit_button = None
-        self.game_theme_button = None
-        
-        # Font - Monospace for better typing experience
-        pygame.font.init()
-        try:
-            # Try to use a monospace font for better character alignment
-            self.typing_font = pygame.font.SysFont('Monaco', 32)  # macOS monospace
-            if not self.typing_font:
-                self.typing_font = pygame.font.SysFont('Courier', 32)  # Fallback
-        except:
-            self.typing_font = pygame.font.Font(None, 32)
+        # Buttons register themselves per game state as they are drawn
+        self.widgets = WidgetRegistry()
         
-        self.ui_font = pygame.font.Font(None, 24)
-        self.title_font = pygame.font.Font(None, 48)
+        # Fonts and screen geometry for the window size
+        with self.startup.phase("fonts"):
+            pygame.font.init()
+            self.apply_resolution(*self.screen.get_size())
         
-        # Game state
+        # Game state; the typing rules and counters live in the session
         self.game_state = "playing"  # "playing", "finished", "results"
-        self.score = 0
-        self.wpm = 0
-        self.accuracy = 100.0
-        self.current_sentence = ""
-        self.typed_text = ""
+        self.text_file = text_file
+        self.streaming = endless or text_file is not None
+        if self.streaming:
+            # Long passages: typed line by line, no sentence quota or time limit
+            self.session = TypingSession(sentences_per_game=None, time_limit_ms=None)
+        else:
+            self.session = TypingSession()
+        self.passage: Optional[PassageWindow] = None
+        self.scroll_offset = 0.0  # Pixels left to scroll after a line change
+        self.passage_band = 0  # Height kept above the current line for the previous one
+        self.current_layout = None
+        self.sentence_surface: Optional[SentenceSurface] = None
         self.current_char_index = 0
-        self.errors = 0
-        self.start_time = None
-        self.end_time = None
-        self.total_characters_typed = 0
-        self.words = self.load_words_from_csv()
-        self.results_file = os.path.join(os.path.dirname(__file__), '..', 'results.json')
-        self.results_history = self.load_results_history()
+        self.words_pack = words_pack
+        self.adaptive = adaptive
+        self.word_loader: Optional[Future] = None
+        if background_loading:
+            # Start typing with the built-in words; the CSV words replace them
+            # as soon as the worker thread is done
+            self.words = list(BUILTIN_WORDS)
+            self.start_background_word_loading()
+        else:
+            with self.startup.phase("words"):
+                self.words = self.load_words()
+        if model is not None:
+            with self.startup.phase("model"):
+                self.sentence_generator = NgramGenerator(NgramModel.load(model))
+        else:
+            self.sentence_generator = self.make_sentence_generator(self.words)
+        self.prefetcher = SentencePrefetcher(self.prepare_sentence)
+        self.results_file = DEFAULT_RESULTS_FILE
+        self.player = player
+        self.results_store = open_results_store(results_db, self.results_file, player=player)
+        self._results_history = None  # Loaded on first use (results screen)
         self.current_result = None
+        self.history_summary = None  # Analytics for the results screen, per result
         self.game_was_saved = True  # Default to true, will be set to false on ESC quit
+        if self.streaming:
+            self.passage = self.open_passage()
         self.new_sentence()
         
     
-    def load_words_from_csv(self) -> List[str]:
-        """Load and filter words from the CSV file."""
+    # Typing state is owned by the session; these keep the game's attribute names
+    current_sentence = property(lambda self: self.session.sentence)
+    typed_text = property(lambda self: self.session.typed_text)
+    score = property(lambda self: self.session.score)
+    wpm = property(lambda self: self.session.wpm)
+    accuracy = property(lambda self: self.session.accuracy)
+    errors = property(lambda self: self.session.errors)
+    total_characters_typed = property(lambda self: self.session.total_characters_typed)
+    start_time = property(lambda self: self.session.start_time)
+    end_time = property(lambda self: self.session.end_time)
+    
+    def start_background_word_loading(self):
+        """Load the words on a worker thread.
+        
+        The worker only reads files; the game thread swaps the words in when
+        WORDS_LOADED_EVENT arrives.
+        """
+        def load():
+            start = time.perf_counter()
+            return self.load_words(), time.perf_counter() - start
+        
+        def notify(_):
+            # Wake the game loop once the result is available
+            try:
+                pygame.event.post(pygame.event.Event(WORDS_LOADED_EVENT))
+            except pygame.error:
+                pass  # The game already quit
+        
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="typegame-words")
+        self.word_loader = executor.submit(load)
+        self.word_loader.add_done_callback(notify)
+        executor.shutdown(wait=False)
+    
+    def finish_background_word_loading(self):
+        """Swap in the words loaded by the worker thread, if it is done."""
+        if self.word_loader is None or not self.word_loader.done():
+            return
+        loader, self.word_loader = self.word_loader, None
+        try:
+            words, seconds = loader.result()
+        except Exception as e:
+            print(f"Error loading words: {e}")
+            return
+        self.startup.record("words", seconds)
+        self.set_words(words)
+    
+    def set_words(self, words: List[str]):
+        """Replace the vocabulary used for upcoming sentences."""
+        self.words = words
+        if isinstance(self.sentence_generator, NgramGenerator):
+            return  # Sentences come from the model's own vocabulary
+        self.sentence_generator = self.make_sentence_generator(words, self.sentence_generator.weak_letters)
+        # Prefetched sentences came from the old vocabulary
+        self.prefetcher.clear()
+    
+    def make_sentence_generator(self, words: List[str],
+                                weak_letters: Optional[Dict[str, float]] = None) -> SentenceGenerator:
+        """Sentence generator weighting words by their rank in the vocabulary."""
+        # The built-in words are grouped by category, not ranked: pick them uniformly
+        frequency_exponent = 0.0 if words == BUILTIN_WORDS else 1.0
+        return SentenceGenerator(words, frequency_exponent=frequency_exponent, weak_letters=weak_letters)
+    
+    @property
+    def results_history(self) -> List[Dict[str, Any]]:
+        """Recent results, loaded from the store the first time they are needed."""
+        if self._results_history is None:
+            with self.startup.phase("history"):
+                self._results_history = self.load_results_history()
+        return self._results_history
+    
+    @results_history.setter
+    def results_history(self, history: List[Dict[str, Any]]):
+        self._results_history = history
+    
+    def load_words(self) -> List[str]:
+        """The vocabulary: the configured word pack, or the filtered bundled CSV."""
+        if self.words_pack is None:
+            return self.load_words_from_csv()
+        words = wordpack.read_pack(self.words_pack)
+        if not words:
+            raise ValueError(f"cannot read word pack {self.words_pack}")
+        return words
+    
+    def load_words_from_csv(self, limit: int = 1000) -> List[str]:
+        """Load filtered words, using the compiled word pack when it is up to date."""
+        try:
+            key = wordpack.source_key(WORDS_CSV, filter=WORD_FILTER_VERSION,
+                                      min_len=2, max_len=8, limit=limit)
+        except OSError:
+            key = None  # No CSV: fall back to the built-in words below
+        
+        if key is not None:
+            cached = wordpack.read_pack(WORDS_CACHE, key)
+            if cached:
+                return cached
+        
+        words = self.filter_csv_words(WORDS_CSV, limit)
+        
+        if key is not None:
+            try:
+                wordpack.write_pack(WORDS_CACHE, words, key)
+            except OSError:
+                pass  # Read-only install: just filter again next launch
+        
+        return words
+    
+    def filter_csv_words(self, csv_path: str, limit: int = 1000) -> List[str]:
+        """Read the CSV and apply the word quality filters."""
         words = []
-        csv_path = os.path.join(os.path.dirname(__file__), '..', 'assets', 'words', 'words.csv')
-        
-        # Common English words for better sentence construction
-        common_words = {
-            "articles": ["the", "a", "an"],
-            "pronouns": ["i", "you", "he", "she", "it", "we", "they", "this", "that"],
-            "verbs": ["is", "are", "was", "were", "have", "has", "had", "do", "does", "did", "can", "will", "would", "could", "should", "make", "get", "go", "come", "see", "know", "take", "think", "feel", "work", "play", "run", "walk", "talk", "look", "find", "give", "tell", "ask", "need", "want", "help", "try", "show", "move", "live", "write", "read", "learn", "teach", "study"],
-            "prepositions": ["in", "on", "at", "by", "for", "with", "from", "to", "of", "about", "over", "under", "through", "between", "during", "before", "after"],
-            "adjectives": ["good", "bad", "big", "small", "new", "old", "high", "low", "long", "short", "hot", "cold", "fast", "slow", "easy", "hard", "light", "dark", "clean", "dirty", "safe", "dangerous", "happy", "sad", "angry", "calm", "busy", "free", "rich", "poor", "strong", "weak"],
-            "nouns": ["time", "person", "place", "thing", "way", "day", "man", "woman", "child", "life", "world", "school", "work", "home", "family", "friend", "book", "music", "movie", "game", "food", "water", "money", "car", "house", "phone", "computer", "hand", "eye", "head", "body", "word", "problem", "question", "answer", "idea", "story", "job", "business", "service", "party", "meeting"]
-        }
         
-        # Combine all common words
-        quality_words = []
-        for category in common_words.values():
-            quality_words.extend(category)
+        # Prefer the built-in common words for better sentence construction
+        quality_words = list(BUILTIN_WORDS)
+        builtin_words = set(quality_words)
+        # Line of each kept word: the CSV lists words from most to least common
+        ranks = {}
         
         try:
             with open(csv_path, mode='r', encoding='utf-8') as file:
-                for line in file:
+                next(file, None)  # Column header
+                for rank, line in enumerate(file):
                     word = line.strip().lower()
+                    if word in builtin_words:
+                        ranks.setdefault(word, rank)
                     # Filter for quality words: 2-8 chars, only common English patterns
                     if (word and word.isalpha() and 
                         2 <= len(word) <= 8 and 
@@ -224,12 +435,13 @@ class Game:
                         word.count('q') <= 1 and word.count('j') <= 1 and
                         not word.endswith('tion') or word in ['action', 'nation', 'station']):
                         words.append(word)
+                        ranks.setdefault(word, rank)
         except FileNotFoundError:
             pass
         
         # Prefer quality words, but include some from CSV if they're reasonable
         filtered_csv_words = [w for w in words if len(w) >= 3 and 
-                             any(c in 'aeiou' for c in w)][:1000]  # Limit to 1000 best words
+                             any(c in 'aeiou' for c in w)][:limit]  # Limit to the best words
         
         final_words = quality_words + filtered_csv_words
         
@@ -241,6 +453,10 @@ class Game:
                 seen.add(word)
                 result.append(word)
         
+        # Frequency order for the sentence generator's weights; built-in words
+        # missing from the CSV (or all of them, without it) keep their order at the end
+        result.sort(key=lambda word: ranks.get(word, float('inf')))
+        
         return result if result else quality_words
     
     def apply_theme(self):
@@ -253,6 +469,76 @@ class Game:
         self.TEXT_CURRENT = theme['text_current']
         self.CURSOR_COLOR = theme['cursor']
         self.ACCENT_COLOR = theme['accent']
+        # Cached glyphs were rendered in the old theme colors
+        for atlas in self.glyph_atlases.values():
+            atlas.clear()
+        self.fonts.clear_labels()
+        self.sentence_surface = None
+        # Background color changed: everything must be repainted
+        self.damage.invalidate()
+    
+    def set_display_mode(self) -> pygame.Surface:
+        """Open the resizable window, or go fullscreen at the desktop resolution."""
+        if self.fullscreen:
+            return pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        return pygame.display.set_mode(self.windowed_size, pygame.RESIZABLE)
+    
+    def toggle_fullscreen(self):
+        """Switch between fullscreen and the window."""
+        self.fullscreen = not self.fullscreen
+        self.screen = self.set_display_mode()
+        self.resize(*self.screen.get_size())
+    
+    def px(self, value: float) -> int:
+        """A length given for the 800x600 design, in pixels at the current scale."""
+        return scaled(value, self.scale)
+    
+    def apply_resolution(self, width: int, height: int):
+        """Set the scale, screen geometry and fonts for a window size.
+        
+        Fonts, labels and glyph atlases are cached per size, so going back to
+        a size seen before reuses them.
+        """
+        self.width = width
+        self.height = height
+        self.scale = ui_scale(width, height)
+        self.playing_layout = playing_layout(width, height, self.scale)
+        typing_size = self.px(32)
+        try:
+            # Try to use a monospace font for better character alignment
+            self.typing_font = self.fonts.get('Monaco', typing_size)  # macOS monospace
+        except Exception:
+            self.typing_font = self.fonts.get(None, typing_size)
+        self.ui_font = self.fonts.get(None, self.px(24))
+        self.title_font = self.fonts.get(None, self.px(48))
+        atlas = self.glyph_atlases.get(typing_size)
+        if atlas is None:
+            atlas = self.glyph_atlases[typing_size] = GlyphAtlas(self.typing_font)
+        self.glyph_atlas = atlas
+    
+    def resize(self, width: int, height: int):
+        """Lay everything out again for a new window size, once per resize.
+        
+        Text layouts and surfaces made for the old size are dropped; the
+        current sentence is laid out again on the next frame.
+        """
+        if not self.fullscreen:
+            self.windowed_size = (width, height)
+        if (width, height) == (self.width, self.height):
+            return
+        self.apply_resolution(width, height)
+        self.current_layout = None
+        self.sentence_surface = None
+        # Prepared sentences were laid out for the old size
+        self.prefetcher.clear()
+        if self.passage is not None:
+            self.passage.relayout(self.typing_font, self.playing_layout.text_width,
+                                  self.glyph_atlas.width, self.px(10))
+            if self.passage.current is not None:
+                self.current_layout = self.passage.current.layout
+            self.scroll_offset = 0.0
+            self.passage_band = 0
+        self.damage.invalidate()
     
     def cycle_theme(self):
         """Cycle to the next theme."""
@@ -264,11 +550,13 @@ class Game:
         return self.themes[self.current_theme]['name']
     
     def load_results_history(self) -> List[Dict[str, Any]]:
-        """Load previous game results from file."""
+        """Load the most recent game results from the journal."""
         try:
-            if os.path.exists(self.results_file):
-                with open(self.results_file, 'r') as f:
-                    return json.load(f)
+            history = self.results_store.tail(HISTORY_WINDOW)
+            if self.results_store.damaged:
+                # Drop torn or corrupt lines left by an interrupted write
+                self.results_store.compact()
+            return history
         except Exception as e:
             print(f"Error loading results: {e}")
         return []
@@ -276,23 +564,27 @@ class Game:
     def save_result(self, result: Dict[str, Any]):
         """Save a game result to history."""
         self.results_history.append(result)
-        # Keep only last 50 results
-        if len(self.results_history) > 50:
-            self.results_history = self.results_history[-50:]
+        # The full history stays on disk; only recent results are kept in memory
+        if len(self.results_history) > HISTORY_WINDOW:
+            self.results_history = self.results_history[-HISTORY_WINDOW:]
         
         try:
-            with open(self.results_file, 'w') as f:
-                json.dump(self.results_history, f, indent=2)
+            self.results_store.append(result)
         except Exception as e:
             print(f"Error saving results: {e}")
     
     def finish_game(self, save_result=True):
         """Finish the current game and calculate final stats."""
-        self.end_time = pygame.time.get_ticks()
+        self.session.end_time = pygame.time.get_ticks()
         self.game_state = "finished"
+        self.history_summary = None
         self.game_was_saved = save_result  # Track if this game was saved
+        if self.adaptive and isinstance(self.sentence_generator, SentenceGenerator):
+            # Practice the letters missed in this game (tables rebuilt only on change)
+            self.sentence_generator.set_weak_letters(self.session.keylog.error_rates())
+            self.prefetcher.clear()
         
-        if self.start_time:
+        if self.start_time is not None:
             total_time = (self.end_time - self.start_time) / 1000.0  # seconds
             
             # Calculate final statistics
@@ -306,7 +598,9 @@ class Game:
                 "time": round(total_time, 1),
                 "characters_typed": self.total_characters_typed,
                 "errors": self.errors,
-                "sentences_completed": self.score
+                "sentences_completed": self.score,
+                # Per-keystroke timings for latency, burst and bigram analysis
+                "keystrokes": self.session.keylog.encode()
             }
             
             # Save to history only if requested (not for ESC quit)
@@ -326,128 +620,107 @@ class Game:
     
     def generate_sentence(self, min_words: int = 8, max_words: int = 15) -> str:
         """Generate a more natural sentence structure."""
-        if not self.words:
-            return "no words available"
-        
-        # Categorize words for better sentence structure
-        articles = [w for w in self.words if w in ['the', 'a', 'an']]
-        common_words = [w for w in self.words if w in ['i', 'you', 'he', 'she', 'it', 'we', 'they', 'is', 'are', 'was', 'were', 'have', 'has', 'had', 'do', 'does', 'can', 'will', 'would']]
-        other_words = [w for w in self.words if len(w) >= 3 and w not in common_words]
-        
-        sentence_words = []
-        num_words = random.randint(min_words, max_words)
-        
-        # Try to create more natural sentence patterns
-        if articles and random.random() < 0.6:  # 60% chance to start with article
-            sentence_words.append(random.choice(articles))
-            num_words -= 1
-        elif common_words and random.random() < 0.8:  # 80% chance to start with common word
-            sentence_words.append(random.choice(common_words))
-            num_words -= 1
-        
-        # Fill the rest with a more varied mix for longer sentences
-        for i in range(num_words):
-            # Add variety patterns for longer sentences
-            rand = random.random()
-            if common_words and rand < 0.3:  # 30% chance for common words
-                sentence_words.append(random.choice(common_words))
-            elif articles and rand < 0.4 and i > 0:  # 10% chance for mid-sentence articles
-                sentence_words.append(random.choice(articles))
-            elif rand < 0.5:  # 10% chance for connecting words
-                connectors = [w for w in self.words if w in ['and', 'or', 'but', 'with', 'from', 'to', 'in', 'on', 'at', 'for']]
-                if connectors and len(sentence_words) > 2:
-                    sentence_words.append(random.choice(connectors))
-                else:
-                    sentence_words.append(random.choice(other_words if other_words else self.words))
-            else:  # 50% chance for other vocabulary words
-                sentence_words.append(random.choice(other_words if other_words else self.words))
-        
-        return " ".join(sentence_words)
+        return self.sentence_generator.generate(min_words, max_words)
+    
+    def prepare_sentence(self) -> PreparedSentence:
+        """Generate a sentence and do its display work ahead of time."""
+        sentence = self.generate_sentence()
+        layout = self.layout_text(sentence)
+        # Render the glyphs shown first so the switch does not hit FreeType
+        self.glyph_atlas.warm(sentence, self.TEXT_INACTIVE)
+        self.glyph_atlas.warm(sentence, self.TEXT_CORRECT)
+        return PreparedSentence(sentence, layout)
+    
+    def open_passage(self) -> PassageWindow:
+        """Start streaming the passage: a text file, or endless generated sentences."""
+        if self.text_file is not None:
+            words = file_words(self.text_file)
+        else:
+            words = generated_words(self.generate_sentence)
+        return PassageWindow(words, self.typing_font, self.playing_layout.text_width,
+                             self.glyph_atlas.width, line_spacing=self.px(10))
     
     def new_sentence(self):
-        """Generate a new sentence to type."""
-        self.current_sentence = self.generate_sentence()
-        self.typed_text = ""
+        """Switch to the next prefetched sentence (or passage line)."""
+        if self.passage is not None:
+            line = self.passage.next_line()
+            if line is None:
+                # End of the passage
+                self.finish_game(save_result=True)
+                return
+            text, layout = line.layout.text, line.layout
+            if self.passage.previous is not None:
+                # The typed line slides up into place
+                self.scroll_offset = float(self.passage.previous.layout.height)
+        else:
+            prepared = self.prefetcher.pop()
+            text, layout = prepared.text, prepared.layout
+        self.session.start_sentence(text)
+        self.current_layout = layout
+        self.sentence_surface = self.render_sentence_surface(layout)
         self.current_char_index = 0
         # Reset cursor animation to start position
-        self.cursor_target_x = 50  # typing_area_x
-        self.cursor_current_x = 50
+        self.cursor_target_x = self.playing_layout.text_x
+        self.cursor_current_x = self.playing_layout.text_x
         # Don't reset errors and start_time - keep cumulative stats
     
-    def handle_events(self):
-        """Handle pygame events with precise character tracking."""
-        for event in pygame.event.get():
+    def handle_events(self, events: Optional[List[pygame.event.Event]] = None):
+        """Handle pygame events with precise character tracking.
+        
+        events: already-dequeued events; by default the pygame queue is drained.
+        """
+        if events is None:
+            events = pygame.event.get()
+        self.latency.keys_received(sum(1 for event in events if event.type == pygame.KEYDOWN))
+        resized = False
+        mouse_pos = None  # Last pointer position of the batch
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.VIDEORESIZE:
+                # Dragging a window edge sends a burst: lay out once, below
+                resized = True
+            elif event.type == WORDS_LOADED_EVENT:
+                self.finish_background_word_loading()
             elif event.type == pygame.KEYDOWN:
-                if self.game_state == "playing":
+                if event.key == pygame.K_F3:
+                    self.show_latency = not self.show_latency
+                    self.damage.invalidate()
+                elif event.key == pygame.K_F4:
+                    self.toggle_flame_bar()
+                elif event.key == pygame.K_F11:
+                    self.toggle_fullscreen()
+                elif self.game_state == "playing":
                     if event.key == pygame.K_ESCAPE:
-                        # Don't save result when manually quitting
-                        self.finish_game(save_result=False)
+                        # Don't save result when manually quitting, except for
+                        # passages where ESC is the normal way to stop
+                        self.finish_game(save_result=self.streaming)
                     elif event.key == pygame.K_BACKSPACE:
-                        if self.typed_text:
-                            self.typed_text = self.typed_text[:-1]
+                        if self.session.backspace(pygame.time.get_ticks()):
+                            # The erased character and the one after it changed state
+                            typed_count = self.session.typed_count
+                            self.patch_sentence_surface(typed_count, typed_count + 2)
                             # Reset cursor blink when typing
-                            self.cursor_blink_time = 0
+                            self.cursor_blink_start = pygame.time.get_ticks()
                             self.cursor_visible = True
                     elif event.unicode.isprintable():
-                        # Start timer on first keystroke
-                        if self.start_time is None:
-                            self.start_time = pygame.time.get_ticks()
+                        outcome = self.session.type_char(event.unicode, pygame.time.get_ticks())
+                        if outcome == IGNORED:
+                            continue
+                        if outcome == TYPED:
+                            # The typed character and the new current one changed state
+                            typed_count = self.session.typed_count
+                            self.patch_sentence_surface(typed_count - 1, typed_count + 1)
                         
-                        # Allow letters, spaces, and basic punctuation
-                        if event.unicode.isalpha() or event.unicode in ' .,!?;:-':
-                            typed_char = event.unicode.lower()
-                            
-                            # PREVENT typing beyond sentence length
-                            if len(self.typed_text) >= len(self.current_sentence):
-                                continue  # Ignore input if we've reached the end
-                            
-                            # Check if the character matches what should be typed
-                            expected_char = self.current_sentence[len(self.typed_text)].lower()
-                            if typed_char != expected_char:
-                                self.errors += 1
-                            
-                            self.typed_text += typed_char
-                            self.total_characters_typed += 1
-                            
-                            # Reset cursor blink when typing and show cursor
-                            self.cursor_blink_time = 0
-                            self.cursor_visible = True
-                            
-                            # Check if sentence is complete
-                            sentence_completed = False
-                            
-                            if self.typed_text == self.current_sentence:
-                                sentence_completed = True
-                            elif len(self.typed_text) == len(self.current_sentence):
-                                # Backup check: are all characters correct?
-                                all_correct = True
-                                for i in range(len(self.typed_text)):
-                                    if i < len(self.current_sentence):
-                                        if self.typed_text[i] != self.current_sentence[i]:
-                                            all_correct = False
-                                            break
-                                if all_correct:
-                                    sentence_completed = True
-                            
-                            # Handle sentence completion
-                            if sentence_completed:
-                                self.score += 1
-                                
-                                # End game after 3 sentences or 60 seconds
-                                if self.score >= 3 or (self.start_time and 
-                                    (pygame.time.get_ticks() - self.start_time) > 60000):
-                                    # Save result for completed games  
-                                    self.finish_game(save_result=True)
-                                else:
-                                    self.new_sentence()
-                            
-                            # Also end if time limit reached during typing
-                            elif (self.start_time and 
-                                  (pygame.time.get_ticks() - self.start_time) > 60000):
-                                # Save result for time-completed games
-                                self.finish_game(save_result=True)
+                        # Reset cursor blink when typing and show cursor
+                        self.cursor_blink_start = pygame.time.get_ticks()
+                        self.cursor_visible = True
+                        
+                        if outcome == SENTENCE_DONE:
+                            self.new_sentence()
+                        elif outcome == GAME_OVER:
+                            # Save result for completed and timed-out games
+                            self.finish_game(save_result=True)
                 
                 elif self.game_state == "finished":
                     # Handle results screen input
@@ -461,117 +734,108 @@ class Game:
                         self.cycle_theme()
             
             elif event.type == pygame.MOUSEMOTION:
+                # Hover only depends on where the pointer ends up: resolved once, below
                 mouse_pos = event.pos
-                self.hover_button = None
-                
-                if self.game_state == "finished":
-                    # Handle results screen button hover
-                    if (hasattr(self, 'restart_button') and self.restart_button and 
-                        self.restart_button.collidepoint(mouse_pos)):
-                        self.hover_button = 'restart'
-                    elif (hasattr(self, 'details_button') and self.details_button and 
-                          self.details_button.collidepoint(mouse_pos)):
-                        self.hover_button = 'details'
-                    elif (hasattr(self, 'theme_button') and self.theme_button and 
-                          self.theme_button.collidepoint(mouse_pos)):
-                        self.hover_button = 'theme'
-                    elif (hasattr(self, 'quit_button') and self.quit_button and 
-                          self.quit_button.collidepoint(mouse_pos)):
-                        self.hover_button = 'quit'
-                elif self.game_state == "playing":
-                    # Handle game theme button hover
-                    if (hasattr(self, 'game_theme_button') and self.game_theme_button and 
-                        self.game_theme_button.collidepoint(mouse_pos)):
-                        self.hover_button = 'game_theme'
             
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
-                    mouse_pos = event.pos
-                    
-                    if self.game_state == "finished":
-                        # Results screen button clicks
-                        if (hasattr(self, 'restart_button') and self.restart_button and 
-                            self.restart_button.collidepoint(mouse_pos)):
-                            self.restart_game()
-                        elif (hasattr(self, 'details_button') and self.details_button and 
-                              self.details_button.collidepoint(mouse_pos)):
-                            self.show_detailed_stats = not self.show_detailed_stats
-                        elif (hasattr(self, 'theme_button') and self.theme_button and 
-                              self.theme_button.collidepoint(mouse_pos)):
-                            self.cycle_theme()
-                        elif (hasattr(self, 'quit_button') and self.quit_button and 
-                              self.quit_button.collidepoint(mouse_pos)):
-                            self.running = False
-                    elif self.game_state == "playing":
-                        # Game theme button click
-                        if (hasattr(self, 'game_theme_button') and self.game_theme_button and 
-                            self.game_theme_button.collidepoint(mouse_pos)):
-                            self.cycle_theme()
+                    widget = self.widgets.hit(self.game_state, event.pos)
+                    if widget is not None:
+                        widget.action()
+        if mouse_pos is not None:
+            self.update_hover(mouse_pos)
+        if resized:
+            self.screen = pygame.display.get_surface()
+            self.resize(*self.screen.get_size())
+        self.latency.updated()
+    
+    def update_hover(self, mouse_pos: Tuple[int, int]):
+        """Highlight the button under the pointer on the current screen."""
+        widget = self.widgets.hit(self.game_state, mouse_pos)
+        self.hover_button = widget.name if widget is not None else None
+    
+    def toggle_detailed_stats(self):
+        self.show_detailed_stats = not self.show_detailed_stats
+    
+    def quit(self):
+        self.running = False
+    
+    def toggle_flame_bar(self):
+        """Show or hide the frame profile; profiling runs while it is shown."""
+        self.show_flame_bar = not self.show_flame_bar
+        self.profiler.enabled = self.show_flame_bar or self.profiling_requested
+        self.damage.invalidate()
     
     def restart_game(self):
         """Restart the game with fresh state."""
         self.game_state = "playing"
-        self.score = 0
-        self.wpm = 0
-        self.accuracy = 100.0
-        self.errors = 0
-        self.start_time = None
-        self.end_time = None
-        self.total_characters_typed = 0
+        self.session.reset()
         self.current_result = None
+        if self.streaming:
+            self.scroll_offset = 0.0
+            self.passage = self.open_passage()
         self.new_sentence()
     
     def wrap_text_for_typing(self, text: str, max_width: int) -> List[str]:
         """Wrap text to fit within typing area, preserving character positions."""
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            test_width = self.typing_font.size(test_line)[0]
-            
-            if test_width <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return lines
+        return wrap_text(text, self.typing_font, max_width)
+    
+    def layout_text(self, text: str) -> TextLayout:
+        """Lay out text for the typing area (per-character positions)."""
+        return TextLayout(text, self.typing_font, self.playing_layout.text_width, self.glyph_atlas.width,
+                          line_spacing=self.px(10))
+    
+    def get_sentence_layout(self) -> TextLayout:
+        """Layout of the current sentence, rebuilt only if the sentence, font or width changed."""
+        layout = self.current_layout
+        if layout is None or not layout.matches(self.current_sentence, self.typing_font,
+                                                self.playing_layout.text_width):
+            layout = self.current_layout = self.layout_text(self.current_sentence)
+        return layout
+    
+    def render_sentence_surface(self, layout: TextLayout) -> SentenceSurface:
+        """Draw a sentence layout offscreen for the current typing state."""
+        colors = TypingColors(self.BG_COLOR, self.TEXT_INACTIVE, self.TEXT_CORRECT,
+                              self.TEXT_INCORRECT, self.TEXT_CURRENT)
+        surface = SentenceSurface(layout, self.glyph_atlas, colors,
+                                  margin=self.px(SentenceSurface.MARGIN), border=self.px(SentenceSurface.BORDER))
+        surface.render(self.session)
+        return surface
+    
+    def get_sentence_surface(self) -> SentenceSurface:
+        """Offscreen sentence, re-rendered only if it is missing or out of date."""
+        layout = self.get_sentence_layout()
+        surface = self.sentence_surface
+        if surface is None or surface.layout is not layout:
+            surface = self.sentence_surface = self.render_sentence_surface(layout)
+        elif surface.revision != self.session.revision:
+            # Typing state changed without a patch (e.g. a restart)
+            surface.render(self.session)
+        return surface
     
-    def get_character_position(self, char_index: int, lines: List[str]) -> Tuple[int, int]:
+    def patch_sentence_surface(self, start: int, stop: int):
+        """Repaint the characters whose typing state just changed."""
+        if self.sentence_surface is not None:
+            self.sentence_surface.patch(self.session, start, stop)
+    
+    def get_character_position(self, char_index: int) -> Tuple[int, int]:
         """Get the screen position (line, position_in_line) for a character index."""
-        current_index = 0
-        
-        for line_num, line in enumerate(lines):
-            if current_index + len(line) >= char_index:
-                return line_num, char_index - current_index
-            current_index += len(line)
-            if line_num < len(lines) - 1:  # Add space between lines
-                current_index += 1
-        
-        return len(lines) - 1, len(lines[-1]) if lines else 0
+        return self.get_sentence_layout().line_and_column(char_index)
     
     def calculate_stats(self):
         """Calculate WPM and accuracy - fixed to match Monkeytype standards."""
-        if self.start_time and self.total_characters_typed > 0:
-            elapsed_time = (pygame.time.get_ticks() - self.start_time) / 1000.0 / 60.0  # minutes
-            if elapsed_time > 0.01:  # Avoid division by very small numbers
-                # Monkeytype-style WPM: total characters typed / 5 / minutes
-                # This includes all keystrokes (correct + incorrect)
-                self.wpm = int((self.total_characters_typed / 5.0) / elapsed_time)
-                
-                # Cap WPM at reasonable maximum to avoid display issues
-                self.wpm = min(self.wpm, 999)
-            
-            # Accuracy calculation based on total keystrokes vs errors
-            if self.total_characters_typed > 0:
-                self.accuracy = ((self.total_characters_typed - self.errors) / self.total_characters_typed) * 100
-                self.accuracy = max(0, min(100, self.accuracy))  # Clamp between 0-100
+        self.session.calculate_stats(pygame.time.get_ticks())
+    
+    def get_history_summary(self) -> Dict[str, Any]:
+        """Analytics over the recent history and this game's keystrokes, computed once per result."""
+        if self.history_summary is None:
+            # Imported here so numpy is not loaded before the first results screen
+            from . import analytics
+            summary = analytics.summarize(self.results_history)
+            deltas, _, _ = analytics.keystroke_arrays([self.current_result])
+            summary["game_interval_std"] = analytics.consistency(deltas)[1]
+            self.history_summary = summary
+        return self.history_summary
     
     def get_wpm_level(self, wpm):
         """Get WPM level and color."""
@@ -603,6 +867,7 @@ class Game:
         else:
             return (255, 99, 71)  # Tomato
     
+    @profiled("button")
     def draw_button(self, text, x, y, width, height, is_hovered=False):
         """Draw a clickable button."""
         # Button colors
@@ -613,62 +878,80 @@ class Game:
         # Draw button
         button_rect = pygame.Rect(x, y, width, height)
         pygame.draw.rect(self.screen, bg_color, button_rect)
-        pygame.draw.rect(self.screen, border_color, button_rect, 2)
+        pygame.draw.rect(self.screen, border_color, button_rect, self.px(2))
         
         # Draw text
-        button_text = self.ui_font.render(text, True, text_color)
+        button_text = self.fonts.label(text, self.px(24), text_color)
         text_rect = button_text.get_rect(center=button_rect.center)
         self.screen.blit(button_text, text_rect)
         
         return button_rect
     
+    def add_button(self, name: str, text: str, x: int, y: int, width: int, height: int,
+                   action: Callable[[], None]) -> pygame.Rect:
+        """Draw a button and register it for hover and clicks on the current screen."""
+        button_rect = self.draw_button(text, x, y, width, height, self.hover_button == name)
+        self.widgets.register(self.game_state, name, button_rect, action)
+        return button_rect
+    
+    @profiled("results")
     def draw_results_screen(self):
         """Draw the professional results screen."""
+        # The results screen is static until the result, layout or hover changes
+        results_key = (id(self.current_result), self.show_detailed_stats, self.hover_button,
+                       self.game_was_saved, len(self.results_history))
+        if not self.damage.check('results', self.screen.get_rect(), results_key):
+            return
+        
         self.screen.fill(self.BG_COLOR)
         
         if not self.current_result:
             return
         
         # Title section
-        title_y = 40
-        title_text = pygame.font.Font(None, 54).render("Résultats de Performance", True, self.TEXT_CORRECT)
+        title_y = self.px(40)
+        title_text = self.fonts.label("Résultats de Performance", self.px(54), self.TEXT_CORRECT)
         title_rect = title_text.get_rect(center=(self.width // 2, title_y))
         self.screen.blit(title_text, title_rect)
         
         # Warning if not saved
         if not self.game_was_saved:
-            warning_text = self.ui_font.render("Session non sauvegardée", True, self.TEXT_INCORRECT)
-            warning_rect = warning_text.get_rect(center=(self.width // 2, title_y + 35))
+            warning_text = self.fonts.label("Session non sauvegardée", self.px(24), self.TEXT_INCORRECT)
+            warning_rect = warning_text.get_rect(center=(self.width // 2, title_y + self.px(35)))
             self.screen.blit(warning_text, warning_rect)
         
         # Main stats section
-        main_y = 120 if not self.game_was_saved else 100
+        main_y = self.px(120 if not self.game_was_saved else 100)
         
         # WPM with level
         wpm_level, level_color = self.get_wpm_level(self.current_result['wpm'])
-        wpm_large = pygame.font.Font(None, 96).render(str(self.current_result['wpm']), True, level_color)
+        wpm_large = self.fonts.get(None, self.px(96)).render(str(self.current_result['wpm']), True, level_color)
         wpm_rect = wpm_large.get_rect(center=(self.width // 2, main_y))
         self.screen.blit(wpm_large, wpm_rect)
         
         # WPM label
-        wpm_label = pygame.font.Font(None, 32).render("Mots / Minute", True, self.TEXT_INACTIVE)
-        wpm_label_rect = wpm_label.get_rect(center=(self.width // 2, main_y + 50))
+        wpm_label = self.fonts.label("Mots / Minute", self.px(32), self.TEXT_INACTIVE)
+        wpm_label_rect = wpm_label.get_rect(center=(self.width // 2, main_y + self.px(50)))
         self.screen.blit(wpm_label, wpm_label_rect)
         
         # Level badge
-        level_text = pygame.font.Font(None, 28).render(f"Niveau: {wpm_level}", True, level_color)
-        level_rect = level_text.get_rect(center=(self.width // 2, main_y + 80))
+        level_text = self.fonts.get(None, self.px(28)).render(f"Niveau: {wpm_level}", True, level_color)
+        level_rect = level_text.get_rect(center=(self.width // 2, main_y + self.px(80)))
         # Level background
-        level_bg = pygame.Rect(level_rect.x - 10, level_rect.y - 5, level_rect.width + 20, level_rect.height + 10)
+        level_bg = level_rect.inflate(self.px(20), self.px(10))
         pygame.draw.rect(self.screen, (40, 40, 40), level_bg)
-        pygame.draw.rect(self.screen, level_color, level_bg, 2)
+        pygame.draw.rect(self.screen, level_color, level_bg, self.px(2))
         self.screen.blit(level_text, level_rect)
         
         # Stats cards section
-        cards_y = main_y + 130
-        card_width = 180
-        card_height = 80
-        card_spacing = 20  # Space between cards
+        cards_y = main_y + self.px(130)
+        card_width = self.px(180)
+        card_height = self.px(80)
+        card_spacing = self.px(20)  # Space between cards
+        card_padding = self.px(10)
+        card_value_y = self.px(35)
+        card_title_size = self.px(24)
+        card_value_font = self.fonts.get(None, self.px(36))
         total_cards_width = (3 * card_width) + (2 * card_spacing)
         start_x = (self.width - total_cards_width) // 2
         
@@ -676,72 +959,83 @@ class Game:
         accuracy_color = self.get_accuracy_color(self.current_result['accuracy'])
         accuracy_rect = pygame.Rect(start_x, cards_y, card_width, card_height)
         pygame.draw.rect(self.screen, (40, 40, 40), accuracy_rect)
-        pygame.draw.rect(self.screen, accuracy_color, accuracy_rect, 2)
+        pygame.draw.rect(self.screen, accuracy_color, accuracy_rect, self.px(2))
         
-        acc_title = pygame.font.Font(None, 24).render("Précision", True, self.TEXT_INACTIVE)
-        acc_value = pygame.font.Font(None, 36).render(f"{self.current_result['accuracy']:.1f}%", True, accuracy_color)
-        self.screen.blit(acc_title, (start_x + 10, cards_y + 10))
-        self.screen.blit(acc_value, (start_x + 10, cards_y + 35))
+        acc_title = self.fonts.label("Précision", card_title_size, self.TEXT_INACTIVE)
+        acc_value = card_value_font.render(f"{self.current_result['accuracy']:.1f}%", True, accuracy_color)
+        self.screen.blit(acc_title, (start_x + card_padding, cards_y + card_padding))
+        self.screen.blit(acc_value, (start_x + card_padding, cards_y + card_value_y))
         
         # Time card  
         time_x = start_x + card_width + card_spacing
         time_rect = pygame.Rect(time_x, cards_y, card_width, card_height)
         pygame.draw.rect(self.screen, (40, 40, 40), time_rect)
-        pygame.draw.rect(self.screen, self.TEXT_CURRENT, time_rect, 2)
+        pygame.draw.rect(self.screen, self.TEXT_CURRENT, time_rect, self.px(2))
         
-        time_title = pygame.font.Font(None, 24).render("Temps", True, self.TEXT_INACTIVE)
-        time_value = pygame.font.Font(None, 36).render(f"{self.current_result['time']:.1f}s", True, self.TEXT_CURRENT)
-        self.screen.blit(time_title, (time_x + 10, cards_y + 10))
-        self.screen.blit(time_value, (time_x + 10, cards_y + 35))
+        time_title = self.fonts.label("Temps", card_title_size, self.TEXT_INACTIVE)
+        time_value = card_value_font.render(f"{self.current_result['time']:.1f}s", True, self.TEXT_CURRENT)
+        self.screen.blit(time_title, (time_x + card_padding, cards_y + card_padding))
+        self.screen.blit(time_value, (time_x + card_padding, cards_y + card_value_y))
         
         # Errors card
         error_x = start_x + 2 * (card_width + card_spacing)
         error_color = self.TEXT_CORRECT if self.current_result['errors'] == 0 else self.TEXT_INCORRECT
         error_rect = pygame.Rect(error_x, cards_y, card_width, card_height)
         pygame.draw.rect(self.screen, (40, 40, 40), error_rect)
-        pygame.draw.rect(self.screen, error_color, error_rect, 2)
+        pygame.draw.rect(self.screen, error_color, error_rect, self.px(2))
         
-        err_title = pygame.font.Font(None, 24).render("Erreurs", True, self.TEXT_INACTIVE)
-        err_value = pygame.font.Font(None, 36).render(str(self.current_result['errors']), True, error_color)
-        self.screen.blit(err_title, (error_x + 10, cards_y + 10))
-        self.screen.blit(err_value, (error_x + 10, cards_y + 35))
+        err_title = self.fonts.label("Erreurs", card_title_size, self.TEXT_INACTIVE)
+        err_value = card_value_font.render(str(self.current_result['errors']), True, error_color)
+        self.screen.blit(err_title, (error_x + card_padding, cards_y + card_padding))
+        self.screen.blit(err_value, (error_x + card_padding, cards_y + card_value_y))
         
         # Additional stats (if space allows)
         if self.show_detailed_stats:
-            detail_y = cards_y + 110
-            details = [
-                f"Caractères tapés: {self.current_result['characters_typed']}",
-                f"Phrases complétées: {self.current_result['sentences_completed']}/3",
-                f"Vitesse moyenne: {self.current_result['characters_typed'] / self.current_result['time']:.1f} car/sec"
-            ]
-            
-            for i, detail in enumerate(details):
-                detail_text = self.ui_font.render(detail, True, self.TEXT_INACTIVE)
-                detail_rect = detail_text.get_rect(center=(self.width // 2, detail_y + i * 25))
-                self.screen.blit(detail_text, detail_rect)
+            with self.profiler.zone("details"):
+                detail_y = cards_y + self.px(110)
+                completed = self.current_result['sentences_completed']
+                details = [
+                    f"Caractères tapés: {self.current_result['characters_typed']}",
+                    # Passages have no quota and count lines, like the playing screen
+                    f"Lignes complétées: {completed}" if self.streaming else f"Phrases complétées: {completed}/3",
+                    f"Vitesse moyenne: {self.current_result['characters_typed'] / self.current_result['time']:.1f} car/sec"
+                ]
+                summary = self.get_history_summary()
+                if summary["sessions"] > 1:
+                    details.append(f"Moyenne glissante: {summary['wpm_rolling']:.0f} WPM | "
+                                   f"Tendance: {summary['wpm_trend']:+.1f}/partie | "
+                                   f"Régularité: ±{summary['game_interval_std']:.0f} ms")
+                
+                for i, detail in enumerate(details):
+                    detail_text = self.ui_font.render(detail, True, self.TEXT_INACTIVE)
+                    detail_rect = detail_text.get_rect(center=(self.width // 2, detail_y + i * self.px(25)))
+                    self.screen.blit(detail_text, detail_rect)
         
         # History graph (smaller) - adjust position to avoid overlap
         if len(self.results_history) > 1:
-            graph_y = cards_y + (220 if self.show_detailed_stats else 110)
+            graph_y = cards_y + self.px(220 if self.show_detailed_stats else 110)
             self.draw_compact_history_graph(graph_y)
+        
+        self.draw_results_buttons()
     
+    @profiled("history graph")
     def draw_compact_history_graph(self, y_pos):
         """Draw a smaller, compact version of the history graph."""
         if len(self.results_history) < 2:
             return
         
         # Graph dimensions
-        graph_width = self.width - 100
-        graph_height = 80
-        graph_x = 50
+        graph_x = self.px(50)
+        graph_width = self.width - 2 * graph_x
+        graph_height = self.px(80)
         
         # Background
         pygame.draw.rect(self.screen, (30, 30, 30), (graph_x, y_pos, graph_width, graph_height))
         pygame.draw.rect(self.screen, (60, 60, 60), (graph_x, y_pos, graph_width, graph_height), 1)
         
         # Title
-        graph_title = pygame.font.Font(None, 20).render("Progression WPM", True, self.TEXT_INACTIVE)
-        title_rect = graph_title.get_rect(center=(self.width // 2, y_pos - 15))
+        graph_title = self.fonts.label("Progression WPM", self.px(20), self.TEXT_INACTIVE)
+        title_rect = graph_title.get_rect(center=(self.width // 2, y_pos - self.px(15)))
         self.screen.blit(graph_title, title_rect)
         
         # Get recent results
@@ -768,18 +1062,22 @@ class Game:
         
         # Draw line
         if len(points) > 1:
-            pygame.draw.lines(self.screen, self.TEXT_CURRENT, False, points, 2)
+            pygame.draw.lines(self.screen, self.TEXT_CURRENT, False, points, self.px(2))
         
         # Draw points
         for i, point in enumerate(points):
             color = self.TEXT_CORRECT if i == len(points) - 1 else self.TEXT_CURRENT
-            pygame.draw.circle(self.screen, color, point, 3)
-        
+            pygame.draw.circle(self.screen, color, point, self.px(3))
+    
+    def draw_results_buttons(self):
+        """Draw the results screen buttons and register them for clicks."""
         # Action buttons - adjust position based on content
-        base_button_y = self.height - 80
-        button_y = base_button_y if not self.show_detailed_stats or len(self.results_history) <= 1 else base_button_y + 20
-        button_height = 40
-        button_spacing = 20  # Space between buttons
+        base_button_y = self.height - self.px(80)
+        button_y = (base_button_y if not self.show_detailed_stats or len(self.results_history) <= 1
+                    else base_button_y + self.px(20))
+        button_height = self.px(40)
+        button_spacing = self.px(20)  # Space between buttons
+        button_padding = self.px(20)
         
         # Calculate individual button widths based on text content
         restart_text = "Rejouer"
@@ -787,10 +1085,10 @@ class Game:
         theme_text = f"Theme: {self.get_theme_name()}"
         quit_text = "Quitter"
         
-        restart_width = max(100, self.ui_font.size(restart_text)[0] + 20)
-        details_width = max(80, self.ui_font.size(details_text)[0] + 20)
-        theme_width = max(120, self.ui_font.size(theme_text)[0] + 20)
-        quit_width = max(80, self.ui_font.size(quit_text)[0] + 20)
+        restart_width = max(self.px(100), self.ui_font.size(restart_text)[0] + button_padding)
+        details_width = max(self.px(80), self.ui_font.size(details_text)[0] + button_padding)
+        theme_width = max(self.px(120), self.ui_font.size(theme_text)[0] + button_padding)
+        quit_width = max(self.px(80), self.ui_font.size(quit_text)[0] + button_padding)
         
         total_buttons_width = restart_width + details_width + theme_width + quit_width + (3 * button_spacing)
         
@@ -799,42 +1097,41 @@ class Game:
         
         # Restart button
         restart_x = buttons_start_x
-        restart_hovered = self.hover_button == 'restart'
-        self.restart_button = self.draw_button(restart_text, restart_x, button_y, restart_width, button_height, restart_hovered)
+        self.add_button('restart', restart_text, restart_x, button_y, restart_width, button_height,
+                        self.restart_game)
         
         # Details toggle button
         details_x = restart_x + restart_width + button_spacing
-        details_hovered = self.hover_button == 'details'
-        self.details_button = self.draw_button(details_text, details_x, button_y, details_width, button_height, details_hovered)
+        self.add_button('details', details_text, details_x, button_y, details_width, button_height,
+                        self.toggle_detailed_stats)
         
         # Theme button
         theme_x = details_x + details_width + button_spacing
-        theme_hovered = self.hover_button == 'theme'
-        self.theme_button = self.draw_button(theme_text, theme_x, button_y, theme_width, button_height, theme_hovered)
+        self.add_button('theme', theme_text, theme_x, button_y, theme_width, button_height, self.cycle_theme)
         
         # Quit button
         quit_x = theme_x + theme_width + button_spacing
-        quit_hovered = self.hover_button == 'quit'
-        self.quit_button = self.draw_button(quit_text, quit_x, button_y, quit_width, button_height, quit_hovered)
+        self.add_button('quit', quit_text, quit_x, button_y, quit_width, button_height, self.quit)
     
+    @profiled("history graph")
     def draw_history_graph(self):
         """Draw a line graph of WPM history."""
         if len(self.results_history) < 2:
             return
         
         # Graph area
-        graph_x = 100
-        graph_y = 420
-        graph_width = self.width - 200
-        graph_height = 120
+        graph_x = self.px(100)
+        graph_y = self.px(420)
+        graph_width = self.width - 2 * graph_x
+        graph_height = self.px(120)
         
         # Graph background
         pygame.draw.rect(self.screen, (40, 40, 40), (graph_x, graph_y, graph_width, graph_height))
         pygame.draw.rect(self.screen, self.TEXT_INACTIVE, (graph_x, graph_y, graph_width, graph_height), 1)
         
         # Graph title
-        graph_title = self.ui_font.render("Historique WPM (dernières parties)", True, self.TEXT_CORRECT)
-        title_rect = graph_title.get_rect(center=(self.width // 2, graph_y - 20))
+        graph_title = self.fonts.label("Historique WPM (dernières parties)", self.px(24), self.TEXT_CORRECT)
+        title_rect = graph_title.get_rect(center=(self.width // 2, graph_y - self.px(20)))
         self.screen.blit(graph_title, title_rect)
         
         # Get last 20 results for the graph
@@ -859,8 +1156,8 @@ class Game:
             
             # Y-axis labels
             label_wpm = int(max_wpm - (i * wpm_range / 4))
-            label_text = pygame.font.Font(None, 16).render(str(label_wpm), True, self.TEXT_INACTIVE)
-            self.screen.blit(label_text, (graph_x - 30, grid_y - 8))
+            label_text = self.fonts.get(None, self.px(16)).render(str(label_wpm), True, self.TEXT_INACTIVE)
+            self.screen.blit(label_text, (graph_x - self.px(30), grid_y - self.px(8)))
         
         # Draw the line graph
         points = []
@@ -871,33 +1168,80 @@ class Game:
         
         # Draw lines between points
         if len(points) > 1:
-            pygame.draw.lines(self.screen, self.TEXT_CURRENT, False, points, 2)
+            pygame.draw.lines(self.screen, self.TEXT_CURRENT, False, points, self.px(2))
         
         # Draw points
         for point in points:
-            pygame.draw.circle(self.screen, self.TEXT_CURRENT, point, 3)
+            pygame.draw.circle(self.screen, self.TEXT_CURRENT, point, self.px(3))
         
         # Highlight current game result
         if len(points) > 0:
-            pygame.draw.circle(self.screen, self.TEXT_CORRECT, points[-1], 5)
+            pygame.draw.circle(self.screen, self.TEXT_CORRECT, points[-1], self.px(5))
     
     def draw(self):
         """Draw the appropriate screen based on game state."""
-        if self.game_state == "finished":
-            self.draw_results_screen()
-        else:
-            self.draw_playing_screen()
+        if self.game_state != self.drawn_state:
+            # Switching screens repaints everything
+            self.drawn_state = self.game_state
+            self.damage.invalidate()
         
-        pygame.display.flip()
+        if self.damage.full_redraw:
+            self.screen.fill(self.BG_COLOR)
+        
+        with self.profiler.zone("draw"):
+            if self.game_state == "finished":
+                self.draw_results_screen()
+            else:
+                self.draw_playing_screen()
+        if self.show_flame_bar:
+            self.draw_flame_bar()
+        
+        self.latency.rendered()
+        with self.profiler.zone("present"):
+            self.damage.present()
+        self.latency.presented()
+    
+    def draw_flame_bar(self):
+        """Zones of the last profiled frame along the top edge, scaled to the frame budget.
+        
+        The full width is one frame at the frame cap (60 FPS when uncapped);
+        nested zones go on the rows below their parent.
+        """
+        frame = self.profiler.last_frame
+        row_height = self.px(FLAME_ROW_HEIGHT)
+        bar_rect = pygame.Rect(0, 0, self.width, row_height * FLAME_ROWS)
+        if not self.damage.check('flame', bar_rect, self.profiler.frame_count):
+            return
+        self.screen.fill(self.BG_COLOR, bar_rect)
+        if frame is None:
+            return
+        budget = 1.0 / (self.fps or 60)
+        scale = self.width / budget
+        for name, depth, start, duration in frame.zones:
+            if depth >= FLAME_ROWS:
+                continue
+            color = self.flame_colors.get(name)
+            if color is None:
+                color = self.flame_colors[name] = FLAME_COLORS[len(self.flame_colors) % len(FLAME_COLORS)]
+            zone_rect = pygame.Rect(int(start * scale), depth * row_height,
+                                    max(1, int(duration * scale)), row_height - 1)
+            self.screen.fill(color, zone_rect.clip(bar_rect))
+        label = self.fonts.get(None, self.px(16)).render(f"{frame.duration * 1000:.1f} ms", True, self.TEXT_CURRENT)
+        self.screen.blit(label, label.get_rect(topright=(self.width - self.px(5), self.px(2))))
+    
     
     def draw_playing_screen(self):
-        """Draw the game screen with Monkeytype-style interface."""
-        self.screen.fill(self.BG_COLOR)
-        # Update cursor blink animation
-        self.cursor_blink_time += self.clock.get_time()
-        if self.cursor_blink_time > 530:  # Blink every 530ms
+        """Draw the game screen with Monkeytype-style interface.
+        
+        Each region (stats, debug, typing area, footer) is only repainted when
+        the content it shows changed since the last frame.
+        """
+        # Update cursor blink animation from the real time: after a blocking
+        # wait, the clock's frame time is still the previous frame's
+        now = pygame.time.get_ticks()
+        if now - self.cursor_blink_start > CURSOR_BLINK_MS:
             self.cursor_visible = not self.cursor_visible
-            self.cursor_blink_time = 0
+            self.cursor_blink_start = now
         
         # Smooth cursor animation
         if self.cursor_current_x != self.cursor_target_x:
@@ -907,162 +1251,236 @@ class Game:
             else:
                 self.cursor_current_x += diff * 0.2  # Smooth interpolation
         
+        # Smooth scrolling after a passage line change
+        if self.scroll_offset:
+            self.scroll_offset *= 0.8
+            if self.scroll_offset < 0.5:
+                self.scroll_offset = 0.0
+        
         # Calculate stats
-        self.calculate_stats()
+        with self.profiler.zone("calculate stats"):
+            self.calculate_stats()
         
         # Draw timer and game info
-        if self.start_time:
+        if self.streaming:
+            # No time limit: show the time spent instead
+            elapsed = (pygame.time.get_ticks() - self.start_time) / 1000.0 if self.start_time is not None else 0
+            timer_text = f"Temps: {elapsed:.1f}s"
+            progress_text = f"Lignes: {self.score}"
+        elif self.start_time is not None:
             elapsed = (pygame.time.get_ticks() - self.start_time) / 1000.0
             remaining = max(0, 60 - elapsed)
             timer_text = f"Temps: {remaining:.1f}s"
+            progress_text = f"Phrases: {self.score}/3"
         else:
             timer_text = "Temps: 60.0s"
+            progress_text = f"Phrases: {self.score}/3"
+        
+        # Draw stats at the top; region positions are computed once per window size
+        screen_layout = self.playing_layout
+        stats_y = screen_layout.stats_y
+        stats_texts = (timer_text, f"WPM: {self.wpm}", f"Précision: {self.accuracy:.1f}%",
+                       progress_text)
+        stats_rect = screen_layout.stats_rect
+        if self.damage.check('stats', stats_rect, stats_texts):
+            with self.profiler.zone("stats"):
+                self.screen.fill(self.BG_COLOR, stats_rect)
+                for text, stats_x in zip(stats_texts, screen_layout.stats_xs):
+                    self.screen.blit(self.ui_font.render(text, True, self.TEXT_CURRENT), (stats_x, stats_y))
         
-        # Draw stats at the top
-        stats_y = 30
-        timer_surface = self.ui_font.render(timer_text, True, self.TEXT_CURRENT)
-        wpm_text = self.ui_font.render(f"WPM: {self.wpm}", True, self.TEXT_CURRENT)
-        accuracy_text = self.ui_font.render(f"Précision: {self.accuracy:.1f}%", True, self.TEXT_CURRENT)
-        score_text = self.ui_font.render(f"Phrases: {self.score}/3", True, self.TEXT_CURRENT)
         # Enhanced debug info
-        if self.start_time:
+        if self.start_time is not None:
             elapsed_sec = (pygame.time.get_ticks() - self.start_time) / 1000.0
-            debug_text = pygame.font.Font(None, 16).render(f"Total: {self.total_characters_typed}, Erreurs: {self.errors}, Temps: {elapsed_sec:.1f}s", True, self.TEXT_INACTIVE)
+            debug_line = f"Total: {self.total_characters_typed}, Erreurs: {self.errors}, Temps: {elapsed_sec:.1f}s"
         else:
-            debug_text = pygame.font.Font(None, 16).render(f"Total: {self.total_characters_typed}, Erreurs: {self.errors}, Temps: 0s", True, self.TEXT_INACTIVE)
-        
+            debug_line = f"Total: {self.total_characters_typed}, Erreurs: {self.errors}, Temps: 0s"
         # Debug: Show sentence completion status
-        completion_debug = pygame.font.Font(None, 16).render(f"Tapé: {len(self.typed_text)}/{len(self.current_sentence)} | Match: {self.typed_text == self.current_sentence}", True, self.TEXT_INACTIVE)
-        
-        self.screen.blit(timer_surface, (50, stats_y))
-        self.screen.blit(wpm_text, (200, stats_y))
-        self.screen.blit(accuracy_text, (350, stats_y))
-        self.screen.blit(score_text, (550, stats_y))
-        # Debug info
-        self.screen.blit(debug_text, (50, stats_y + 25))
-        self.screen.blit(completion_debug, (50, stats_y + 45))
+        completion_line = f"Tapé: {self.session.typed_count}/{len(self.current_sentence)} | Match: {self.session.sentence_complete}"
+        debug_rect = screen_layout.debug_rect
+        if self.damage.check('debug', debug_rect, (debug_line, completion_line)):
+            with self.profiler.zone("debug"):
+                self.screen.fill(self.BG_COLOR, debug_rect)
+                debug_font = self.fonts.get(None, self.px(16))
+                for line, line_y in zip((debug_line, completion_line), screen_layout.debug_ys):
+                    self.screen.blit(debug_font.render(line, True, self.TEXT_INACTIVE),
+                                     (screen_layout.text_x, line_y))
+        
+        # Latency percentiles, toggled with F3
+        if self.show_latency:
+            latency_rect = screen_layout.latency_rect
+            if self.damage.check('latency', latency_rect, self.latency.version):
+                with self.profiler.zone("latency"):
+                    self.screen.fill(self.BG_COLOR, latency_rect)
+                    latency_line = self.latency.overlay_text()
+                    self.screen.blit(self.fonts.get(None, self.px(16)).render(latency_line, True, self.TEXT_INACTIVE),
+                                     (screen_layout.text_x, latency_rect.y + self.px(3)))
         
         # Typing area
-        typing_area_width = self.width - 100
-        typing_area_x = 50
-        typing_area_y = self.height // 2 - 60
-        
-        # Wrap text for display
-        lines = self.wrap_text_for_typing(self.current_sentence, typing_area_width)
-        line_height = self.typing_font.get_height() + 10
-        
-        # Draw each character with appropriate color and update cursor position
-        sentence_char_index = 0  # Index in the original sentence
-        cursor_line_y = typing_area_y  # Track cursor Y position
-        cursor_found = False
-        
-        for line_num, line in enumerate(lines):
-            line_y = typing_area_y + (line_num * line_height)
-            current_x = typing_area_x
-            
-            for char_pos, char in enumerate(line):
-                char_color = self.TEXT_INACTIVE  # Default: untyped (gray)
-                display_char = char  # Character to display
-                
-                if sentence_char_index < len(self.typed_text):
-                    # This character has been typed
-                    typed_char = self.typed_text[sentence_char_index]
-                    if typed_char == char:
-                        char_color = self.TEXT_CORRECT  # Correct (white)
-                    else:
-                        char_color = self.TEXT_INCORRECT  # Incorrect (red)
-                        # SPECIAL CASE: Show incorrect character when expected char is space
-                        if char == ' ':
-                            display_char = typed_char  # Show what was actually typed instead of space
-                            # Draw background highlight to make it more visible
-                            highlight_rect = pygame.Rect(current_x, line_y, self.typing_font.size(typed_char)[0], self.typing_font.get_height())
-                            pygame.draw.rect(self.screen, (80, 20, 20), highlight_rect)  # Dark red background
-                elif sentence_char_index == len(self.typed_text) and not cursor_found:
-                    # This is the current character to type
-                    char_color = self.TEXT_CURRENT  # Current (yellow)
-                    # Update target cursor position ONLY ONCE
-                    self.cursor_target_x = current_x
-                    cursor_line_y = line_y
-                    cursor_found = True
-                
-                # Render and draw the character
-                char_surface = self.typing_font.render(display_char, True, char_color)
-                self.screen.blit(char_surface, (current_x, line_y))
-                
-                current_x += char_surface.get_width()
-                sentence_char_index += 1
-            
-            # Add space character between lines (except for last line)
-            if line_num < len(lines) - 1 and sentence_char_index < len(self.current_sentence):
-                # Handle the space character that was split between lines
-                if sentence_char_index < len(self.typed_text):
-                    # Space was typed
-                    typed_char = self.typed_text[sentence_char_index]
-                    expected_char = self.current_sentence[sentence_char_index]
-                    if typed_char != expected_char:
-                        # ERROR: Wrong character typed instead of space between lines
-                        # Show the incorrect character at the start of next line with highlight
-                        next_line_y = typing_area_y + ((line_num + 1) * line_height)
-                        error_surface = self.typing_font.render(typed_char, True, self.TEXT_INCORRECT)
-                        highlight_rect = pygame.Rect(typing_area_x - 20, next_line_y, error_surface.get_width() + 4, self.typing_font.get_height())
-                        pygame.draw.rect(self.screen, (80, 20, 20), highlight_rect)  # Dark red background
-                        pygame.draw.rect(self.screen, self.TEXT_INCORRECT, highlight_rect, 2)  # Red border
-                        self.screen.blit(error_surface, (typing_area_x - 18, next_line_y))
-                elif sentence_char_index == len(self.typed_text) and not cursor_found:
-                    # Cursor should be at the space position (start of next line)
-                    self.cursor_target_x = typing_area_x  # Start of next line
-                    cursor_line_y = typing_area_y + ((line_num + 1) * line_height)
-                    cursor_found = True
-                
-                sentence_char_index += 1
-        
-        # Handle special case: cursor at end of sentence
-        if not cursor_found and len(self.typed_text) >= len(self.current_sentence):
-            # Position cursor at the end of the last line
-            if lines:
-                last_line_num = len(lines) - 1
-                last_line_y = typing_area_y + (last_line_num * line_height)
-                last_line_width = self.typing_font.size(lines[last_line_num])[0]
-                self.cursor_target_x = typing_area_x + last_line_width
-                cursor_line_y = last_line_y
+        typing_area_x = screen_layout.text_x
+        typing_area_y = screen_layout.text_y
+        footer_y = screen_layout.footer_y
+        
+        # The typing area covers the sentence and its cursor; it changes on
+        # keystrokes, cursor moves and blinks
+        typing_top = typing_area_y - self.px(5)
+        typing_rect = pygame.Rect(0, typing_top, self.width, footer_y - typing_top)
+        typing_key = (self.current_sentence, self.session.revision,
+                      round(self.cursor_current_x), self.cursor_visible)
+        if self.streaming:
+            # Room above the current line for the one just typed, which may
+            # wrap after a resize. The band only grows until the next resize
+            # (a full redraw), so no rows of a taller line are left behind
+            previous = self.passage.previous
+            band = previous.layout.height if previous is not None else self.get_sentence_layout().line_height
+            self.passage_band = max(self.passage_band, band)
+            typing_rect.top = max(typing_rect.top - self.passage_band, screen_layout.latency_rect.bottom)
+            typing_rect.height = footer_y - typing_rect.top
+            typing_key += (round(self.scroll_offset), self.passage_band)
+        if self.damage.check('typing', typing_rect, typing_key):
+            self.screen.fill(self.BG_COLOR, typing_rect)
+            if self.streaming:
+                self.draw_passage(typing_area_x, typing_area_y, typing_rect)
+            else:
+                self.draw_typing_area(typing_area_x, typing_area_y)
+        
+        # Footer: instructions and theme button
+        footer_rect = screen_layout.footer_rect
+        footer_key = (len(self.words), self.hover_button == 'game_theme')
+        if self.damage.check('footer', footer_rect, footer_key):
+            self.screen.fill(self.BG_COLOR, footer_rect)
+            self.draw_playing_footer()
+    
+    @profiled("sentence")
+    def draw_typing_area(self, typing_area_x: int, typing_area_y: int):
+        """Draw the sentence with per-character coloring and the animated cursor."""
+        # The sentence is kept offscreen and patched per keystroke: one blit per frame
+        layout = self.get_sentence_layout()
+        surface = self.get_sentence_surface()
+        self.screen.blit(surface.surface, (typing_area_x - surface.margin, typing_area_y))
+        typed_count = self.session.typed_count
+        font_height = self.typing_font.get_height()
+        
+        # Cursor target: O(1) lookup of the next character to type
+        _, cursor_x, cursor_y = layout.position(min(typed_count, len(self.current_sentence)))
+        self.cursor_target_x = typing_area_x + cursor_x
+        cursor_line_y = typing_area_y + cursor_y
         
         # Draw animated cursor
         if self.cursor_visible:
-            cursor_height = self.typing_font.get_height()
             # Use animated position for smooth movement
             animated_cursor_x = self.cursor_current_x
             pygame.draw.line(self.screen, self.CURSOR_COLOR, 
                            (animated_cursor_x, cursor_line_y), 
-                           (animated_cursor_x, cursor_line_y + cursor_height), 2)
-        
+                           (animated_cursor_x, cursor_line_y + font_height), self.px(2))
+    
+    @profiled("passage")
+    def draw_passage(self, typing_area_x: int, typing_area_y: int, area: pygame.Rect):
+        """Draw the visible lines of a passage, scrolling up after each line.
+        
+        Only the window of lines around the current one is drawn, each from
+        a cached surface, so the cost does not depend on the passage length.
+        Lines are stacked by their real height: after a resize, the current
+        and previous lines may wrap over several rows.
+        """
+        y = typing_area_y + round(self.scroll_offset)
+        self.screen.set_clip(area)
+        previous = self.passage.previous
+        if previous is not None:
+            self.screen.blit(self.passage_line_surface(previous, self.TEXT_CORRECT),
+                             (typing_area_x, y - previous.layout.height))
+        self.draw_typing_area(typing_area_x, y)
+        y += self.get_sentence_layout().height
+        for line in self.passage.upcoming():
+            if y + line.layout.height > area.bottom:
+                break
+            self.screen.blit(self.passage_line_surface(line, self.TEXT_INACTIVE), (typing_area_x, y))
+            y += line.layout.height
+        self.screen.set_clip(None)
+    
+    def passage_line_surface(self, line: PassageLine, color: Tuple[int, int, int]) -> pygame.Surface:
+        """A passage line drawn in one color, rendered once per line and theme."""
+        key = (color, self.BG_COLOR)
+        surface = line.surfaces.get(key)
+        if surface is None:
+            surface = line.surfaces[key] = line_surface(line.layout, self.glyph_atlas, color, self.BG_COLOR)
+        return surface
+    
+    @profiled("footer")
+    def draw_playing_footer(self):
+        """Draw the instructions and the in-game theme button."""
         # Draw instructions at bottom
         instructions = [
             "Tapez le texte affiché ci-dessus | ESC pour terminer",
             f"Mots chargés: {len(self.words):,}"
         ]
         
-        y_offset = self.height - 80
+        y_offset = self.height - self.px(80)
         for instruction in instructions:
-            inst_text = self.ui_font.render(instruction, True, self.TEXT_INACTIVE)
+            inst_text = self.fonts.label(instruction, self.px(24), self.TEXT_INACTIVE)
             inst_rect = inst_text.get_rect(center=(self.width // 2, y_offset))
             self.screen.blit(inst_text, inst_rect)
-            y_offset += 25
+            y_offset += self.px(25)
         
         # Add theme button in bottom-right corner
         theme_button_text = f"Theme: {self.get_theme_name()}"
-        theme_button_width = max(120, self.ui_font.size(theme_button_text)[0] + 20)
-        theme_button_height = 30
-        theme_button_x = self.width - theme_button_width - 20
-        theme_button_y = self.height - theme_button_height - 20
-        theme_hovered = self.hover_button == 'game_theme'
-        self.game_theme_button = self.draw_button(theme_button_text, 
-                                                 theme_button_x, theme_button_y, 
-                                                 theme_button_width, theme_button_height, 
-                                                 theme_hovered)
+        theme_button_width = max(self.px(120), self.ui_font.size(theme_button_text)[0] + self.px(20))
+        theme_button_height = self.px(30)
+        theme_button_x = self.width - theme_button_width - self.px(20)
+        theme_button_y = self.height - theme_button_height - self.px(20)
+        self.add_button('game_theme', theme_button_text, theme_button_x, theme_button_y,
+                        theme_button_width, theme_button_height, self.cycle_theme)
+    
+    def idle_timeout(self) -> Optional[int]:
+        """Milliseconds until the screen next needs redrawing without input.
+        
+        0 means keep running at the frame cap (cursor animation, prefetching),
+        None means nothing changes until the next event.
+        """
+        if not self.streaming and len(self.prefetcher) < self.prefetcher.capacity:
+            return 0
+        if self.game_state != "playing":
+            return None
+        if self.cursor_current_x != self.cursor_target_x or self.scroll_offset:
+            return 0
+        # Next cursor blink
+        timeout = max(1, CURSOR_BLINK_MS + 1 - (pygame.time.get_ticks() - self.cursor_blink_start))
+        if self.start_time is not None:
+            # The timer shows tenths of a second
+            elapsed = pygame.time.get_ticks() - self.start_time
+            timeout = min(timeout, 100 - elapsed % 100)
+        return timeout
+    
+    def wait_for_events(self) -> Optional[List[pygame.event.Event]]:
+        """Sleep until input arrives or the next animation step is due.
+        
+        Returns the events received while waiting, or None when the game is
+        active and handle_events should just poll the queue.
+        """
+        timeout = self.idle_timeout()
+        if timeout == 0:
+            return None
+        event = pygame.event.wait() if timeout is None else pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
     
     def run(self):
-        """Main game loop."""
+        """Main game loop.
+        
+        Runs at the frame cap while typing or animating and otherwise blocks
+        on the event queue until the next cursor blink or timer update.
+        """
         while self.running:
-            self.handle_events()
+            events = self.wait_for_events()
+            # A profiled frame runs from the end of the wait to the frame cap sleep
+            self.profiler.begin_frame()
+            with self.profiler.zone("events"):
+                self.handle_events(events)
             self.draw()
-            self.clock.tick(60)  # 60 FPS
\ No newline at end of file
+            self.startup.report()  # Only prints once, after the first frame
+            # Use the rest of the frame to prepare upcoming sentences
+            if not self.streaming:
+                with self.profiler.zone("prefetch"):
+                    self.prefetcher.fill()
+            self.profiler.end_frame()
+            self.clock.tick(self.fps)
\ No newline at end of file
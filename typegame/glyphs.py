@@ -0,0 +1,49 @@
+"""Glyph atlas: cached per-character text surfaces."""
+
+from typing import Dict, Tuple
+
+import pygame
+
+Color = Tuple[int, int, int]
+
+
+class GlyphAtlas:
+    """Pre-rendered character surfaces for one font, keyed by (char, color).
+
+    Theme colors are part of the key, so a theme change only needs ``clear()``
+    to drop surfaces that will not be used again.
+    """
+
+    def __init__(self, font: pygame.font.Font):
+        self.font = font
+        self._glyphs: Dict[Tuple[str, Color], pygame.Surface] = {}
+        self._widths: Dict[str, int] = {}
+
+    def get(self, char: str, color: Color) -> pygame.Surface:
+        """Return the surface for a character, rendering it on first use."""
+        key = (char, color)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            glyph = self.font.render(char, True, color)
+            self._glyphs[key] = glyph
+        return glyph
+
+    def width(self, char: str) -> int:
+        """Advance width of a character (independent of color)."""
+        width = self._widths.get(char)
+        if width is None:
+            width = self.font.size(char)[0]
+            self._widths[char] = width
+        return width
+
+    def warm(self, text: str, color: Color):
+        """Render every character of text ahead of time."""
+        for char in set(text):
+            self.get(char, color)
+
+    def clear(self):
+        """Drop all cached glyphs (theme or font change)."""
+        self._glyphs.clear()
+
+    def __len__(self) -> int:
+        return len(self._glyphs)
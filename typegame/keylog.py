@@ -0,0 +1,109 @@
+"""Per-keystroke timing capture in a preallocated ring buffer."""
+
+import base64
+import sys
+from array import array
+from typing import Any, Dict, Optional, Tuple
+
+# Character recorded as "typed" for a backspace
+BACKSPACE = "\b"
+
+FORMAT_VERSION = 1
+
+
+def _pack(values: array) -> str:
+    """Little-endian base64 encoding of an array."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _unpack(typecode: str, data: str) -> array:
+    values = array(typecode, base64.b64decode(data))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class KeystrokeLog:
+    """Ring buffer of keystrokes: time since previous key, expected char, typed char, correct flag.
+
+    Storage is allocated once as flat arrays (code points, not str objects),
+    so recording a key costs a few index assignments. When full, the oldest
+    keystrokes are overwritten.
+    """
+
+    def __init__(self, capacity: int = 8192):
+        self.capacity = capacity
+        self.deltas = array('I', bytes(4 * capacity))    # ms since previous keystroke
+        self.expected = array('I', bytes(4 * capacity))  # code point, 0 for backspace
+        self.typed = array('I', bytes(4 * capacity))     # code point
+        self.correct = bytearray(capacity)
+        self.clear()
+
+    def clear(self):
+        """Forget all keystrokes (the buffers are reused)."""
+        self.count = 0  # Total recorded, including overwritten ones
+        self._next = 0
+        self._last_time: Optional[int] = None
+
+    def record(self, now: int, expected: str, typed: str):
+        """Record one keystroke at time ``now`` (ms)."""
+        i = self._next
+        last_time = self._last_time
+        self.deltas[i] = 0 if last_time is None else max(0, now - last_time)
+        self.expected[i] = ord(expected) if expected else 0
+        self.typed[i] = ord(typed)
+        self.correct[i] = expected == typed
+        self._last_time = now
+        self._next = i + 1 if i + 1 < self.capacity else 0
+        self.count += 1
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def _ordered(self, values):
+        """Values oldest first, unrolling the ring."""
+        if self.count <= self.capacity:
+            return values[:self.count]
+        return values[self._next:] + values[:self._next]
+
+    def snapshot(self) -> Tuple[array, str, str, bytearray]:
+        """(deltas, expected chars, typed chars, correct flags), oldest first."""
+        expected = ''.join(map(chr, self._ordered(self.expected)))
+        typed = ''.join(map(chr, self._ordered(self.typed)))
+        return self._ordered(self.deltas), expected, typed, self._ordered(self.correct)
+
+    def error_rates(self, min_attempts: int = 5) -> Dict[str, float]:
+        """Error rate of each letter typed at least min_attempts times, for letters with errors."""
+        attempts: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
+        for expected, correct in zip(self._ordered(self.expected), self._ordered(self.correct)):
+            char = chr(expected)
+            if not char.isalpha():
+                continue  # Spaces, punctuation and backspaces
+            attempts[char] = attempts.get(char, 0) + 1
+            if not correct:
+                errors[char] = errors.get(char, 0) + 1
+        return {char: round(count / attempts[char], 2) for char, count in errors.items()
+                if attempts[char] >= min_attempts}
+
+    def encode(self) -> Dict[str, Any]:
+        """Compact JSON-friendly form, stored alongside a game result."""
+        deltas, expected, typed, _ = self.snapshot()
+        return {"v": FORMAT_VERSION, "deltas": _pack(deltas), "expected": expected, "typed": typed}
+
+    @classmethod
+    def decode(cls, data: Dict[str, Any]) -> "KeystrokeLog":
+        """Rebuild a log from ``encode()`` output."""
+        deltas = _unpack('I', data["deltas"])
+        log = cls(capacity=max(1, len(deltas)))
+        for i, (expected, typed) in enumerate(zip(data["expected"], data["typed"])):
+            log.deltas[i] = deltas[i]
+            log.expected[i] = ord(expected)
+            log.typed[i] = ord(typed)
+            log.correct[i] = expected == typed
+        log.count = log._next = len(deltas)
+        log._next %= log.capacity
+        return log
@@ -0,0 +1,130 @@
+"""Input latency: time from a key event to its frame on screen."""
+
+import json
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+# Intervals measured from the moment a key event is dequeued
+STAGES = ("update", "render", "present")
+STAGE_LABELS = {"update": "état", "render": "rendu", "present": "écran"}
+
+
+class LatencyHistogram:
+    """Rolling histogram of the last ``window`` samples in fixed-size buckets.
+
+    Adding a sample is O(1): the sample falling out of the window is taken
+    back out of its bucket. Percentiles scan the buckets, whose count does
+    not depend on the number of samples. The last bucket collects
+    everything beyond ``bucket_ms * buckets``.
+    """
+
+    def __init__(self, bucket_ms: float = 0.25, buckets: int = 400, window: int = 1000):
+        self.bucket_ms = bucket_ms
+        self.buckets = buckets
+        self.window = window
+        self.counts = array('I', bytes(4 * (buckets + 1)))
+        self._ring = array('H', bytes(2 * window))  # Bucket of each sample in the window
+        self._next = 0
+        self.size = 0
+        self.total = 0  # Samples ever added
+
+    def add(self, ms: float):
+        bucket = min(int(ms / self.bucket_ms), self.buckets)
+        if self.size == self.window:
+            self.counts[self._ring[self._next]] -= 1
+        else:
+            self.size += 1
+        self._ring[self._next] = bucket
+        self.counts[bucket] += 1
+        self._next = self._next + 1 if self._next + 1 < self.window else 0
+        self.total += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper edge in ms of the bucket holding the q-th percentile (None without samples)."""
+        if not self.size:
+            return None
+        rank = q / 100.0 * self.size
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return (bucket + 1) * self.bucket_ms
+        return (self.buckets + 1) * self.bucket_ms
+
+    def percentiles(self, qs: Sequence[float] = (50, 95, 99)) -> Dict[str, Optional[float]]:
+        return {f"p{q:g}": self.percentile(q) for q in qs}
+
+
+class LatencyTracker:
+    """Timestamps key events through the frame that shows them.
+
+    The game calls ``keys_received()`` when events are dequeued, ``updated()``
+    after handling them, ``rendered()`` once the frame is drawn and
+    ``presented()`` after the display update. Keys handled in the same frame
+    share the later timestamps. With no keys pending every call returns at
+    once, so tracking stays on.
+    """
+
+    def __init__(self, window: int = 1000, clock=time.perf_counter):
+        self.histograms = {stage: LatencyHistogram(window=window) for stage in STAGES}
+        self.clock = clock
+        self.version = 0  # Changes whenever new samples are added
+        self._received: List[float] = []
+        self._updated: Optional[float] = None
+        self._rendered: Optional[float] = None
+
+    def keys_received(self, count: int):
+        if count:
+            now = self.clock()
+            self._received.extend([now] * count)
+
+    def updated(self):
+        if self._received:
+            self._updated = self.clock()
+
+    def rendered(self):
+        if self._received:
+            self._rendered = self.clock()
+
+    def presented(self):
+        """Close the frame: record every pending key's latencies."""
+        if not self._received:
+            return
+        now = self.clock()
+        updated = self._updated if self._updated is not None else now
+        rendered = self._rendered if self._rendered is not None else now
+        for received in self._received:
+            for stage, end in zip(STAGES, (updated, rendered, now)):
+                self.histograms[stage].add((end - received) * 1000.0)
+        self._received = []
+        self._updated = self._rendered = None
+        self.version += 1
+
+    def summary(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """p50/p95/p99 in ms of each stage over the rolling window."""
+        return {stage: self.histograms[stage].percentiles() for stage in STAGES}
+
+    def overlay_text(self) -> str:
+        """One-line summary for the on-screen overlay."""
+        if not self.histograms["present"].size:
+            return "Latence: tapez pour mesurer"
+        parts = []
+        for stage, values in self.summary().items():
+            parts.append(f"{STAGE_LABELS[stage]} " + "/".join(f"{value:.1f}" for value in values.values()))
+        return "Latence ms p50/p95/p99 - " + " | ".join(parts)
+
+    def dump(self, path: str):
+        """Write percentiles and bucket counts of every stage as JSON."""
+        data = {}
+        for stage in STAGES:
+            histogram = self.histograms[stage]
+            data[stage] = {
+                "samples": histogram.size,
+                "total": histogram.total,
+                "bucket_ms": histogram.bucket_ms,
+                "percentiles": histogram.percentiles(),
+                "counts": list(histogram.counts),
+            }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
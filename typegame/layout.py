@@ -0,0 +1,102 @@
+"""Text layout: wrapped lines and per-character positions for the typing area."""
+
+from array import array
+from typing import Callable, List, Tuple
+
+import pygame
+
+
+def wrap_text(text: str, font: pygame.font.Font, max_width: int) -> List[str]:
+    """Wrap text on spaces so each line fits max_width.
+
+    The space at each line break is not part of either line, so joining the
+    lines with single spaces gives back the original text.
+    """
+    lines = []
+    current_line = ""
+
+    for word in text.split(' '):
+        test_line = current_line + (" " if current_line else "") + word
+        if font.size(test_line)[0] <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word
+
+    if current_line:
+        lines.append(current_line)
+
+    return lines
+
+
+class TextLayout:
+    """Cached per-character positions of a sentence for one font and width.
+
+    Built once per sentence (and again only on a font or width change), it
+    answers index -> (line, x, y) in O(1). Keystrokes only move the index, so
+    they never touch the layout. Index ``len(text)`` is the end-of-text
+    cursor position, and the spaces swallowed by line breaks map to the start
+    of the following line.
+    """
+
+    def __init__(self, text: str, font: pygame.font.Font, max_width: int,
+                 glyph_width: Callable[[str], int], line_spacing: int = 10):
+        self.text = text
+        self.font = font
+        self.max_width = max_width
+        self.lines = wrap_text(text, font, max_width)
+        self.line_height = font.get_height() + line_spacing
+
+        size = len(text) + 1
+        self.char_line = array('H', bytes(2 * size))
+        self.char_x = array('i', bytes(4 * size))
+        self.line_breaks = set()  # Indices of spaces consumed by a line break
+        self.line_starts = []
+        self.line_widths = []
+
+        index = 0
+        last_line = len(self.lines) - 1
+        for line_num, line in enumerate(self.lines):
+            self.line_starts.append(index)
+            x = 0
+            for char in line:
+                self.char_line[index] = line_num
+                self.char_x[index] = x
+                x += glyph_width(char)
+                index += 1
+            self.line_widths.append(x)
+            if line_num < last_line and index < len(text):
+                # The break space: the cursor jumps to the start of the next line
+                self.char_line[index] = line_num + 1
+                self.char_x[index] = 0
+                self.line_breaks.add(index)
+                index += 1
+
+        # End of text: after the last character of the last line
+        self.char_line[len(text)] = max(last_line, 0)
+        self.char_x[len(text)] = self.line_widths[-1] if self.line_widths else 0
+
+    @property
+    def height(self) -> int:
+        """Height of the wrapped lines, spacing included (one line for empty text)."""
+        return max(len(self.lines), 1) * self.line_height
+
+    def matches(self, text: str, font: pygame.font.Font, max_width: int) -> bool:
+        """True if this layout is still valid for the given text, font and width."""
+        return self.text == text and self.font is font and self.max_width == max_width
+
+    def position(self, index: int) -> Tuple[int, int, int]:
+        """(line, x, y) of a character index, relative to the layout origin."""
+        line = self.char_line[index]
+        return line, self.char_x[index], line * self.line_height
+
+    def line_and_column(self, index: int) -> Tuple[int, int]:
+        """(line, position in line) of a character index.
+
+        A break space sits at column 0 of the following line, like its position.
+        """
+        line = self.char_line[index]
+        if not self.line_starts:
+            return line, 0
+        return line, max(0, index - self.line_starts[line])
@@ -1,23 +1,91 @@
 """Main entry point for the TypeGame."""
 
+import argparse
 import pygame
 import sys
-import pandas as pd
 from .game import Game
+from .profiling import FrameProfiler, StartupProfiler
+from .results import validate_player
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(prog="typegame", description="A Python-based typing game")
+    parser.add_argument("--results-db", metavar="PATH",
+                        help="store results in an SQLite database (imports existing history)")
+    parser.add_argument("--player", metavar="NAME",
+                        help="keep a separate results history for this player")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="frame cap while typing or animating, 0 for uncapped (default: 60)")
+    parser.add_argument("--fullscreen", action="store_true",
+                        help="start fullscreen at the desktop resolution (F11 toggles)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print the time spent in each startup phase")
+    parser.add_argument("--words", metavar="PACK",
+                        help="use a word pack built with 'python -m typegame.corpus'")
+    parser.add_argument("--model", metavar="MODEL",
+                        help="generate sentences with a model trained by 'python -m typegame.ngram'")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="favour words with the letters you mistype most (not with --model)")
+    parser.add_argument("--profile-frames", metavar="PATH",
+                        help="time each frame's draw sections and write the last minute on exit "
+                             "(Chrome trace for .json, CSV otherwise)")
+    parser.add_argument("--latency-log", metavar="PATH",
+                        help="write key-to-screen latency percentiles and histograms to PATH on exit")
+    passage = parser.add_mutually_exclusive_group()
+    passage.add_argument("--endless", action="store_true",
+                         help="type an endless generated passage (ESC to stop)")
+    passage.add_argument("--text", metavar="FILE",
+                         help="type the whole text of a file instead of random sentences")
+    args = parser.parse_args(argv)
+    if args.player is not None:
+        try:
+            validate_player(args.player)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.adaptive and args.model:
+        # Model sentences follow the trained bigrams; word weights do not apply
+        parser.error("--adaptive cannot be used with --model")
+    return args
+
+
+def main(argv=None):
     """Run the typing game."""
-    pygame.init()
+    args = parse_args(argv)
+    startup = StartupProfiler(enabled=args.profile_startup)
+    # About a minute of frames at the default cap
+    profiler = FrameProfiler(enabled=bool(args.profile_frames), history=3600)
+    
+    # Only the subsystems the game uses (no audio, joystick, ...)
+    with startup.phase("pygame init"):
+        pygame.display.init()
+        pygame.font.init()
+        # get_ticks() reads 0 until the SDL timer subsystem is up; a clock starts it
+        pygame.time.Clock()
     
+    game = None
     try:
-        game = Game()
+        game = Game(results_db=args.results_db, fps=args.fps,
+                    background_loading=True, startup=startup,
+                    endless=args.endless, text_file=args.text, words_pack=args.words,
+                    adaptive=args.adaptive, model=args.model, profiler=profiler,
+                    fullscreen=args.fullscreen, player=args.player)
         game.run()
     except KeyboardInterrupt:
         print("\nGame interrupted by user")
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
+        if game is not None and args.latency_log:
+            try:
+                game.latency.dump(args.latency_log)
+            except OSError as e:
+                print(f"Could not write the latency log: {e}")
+        if args.profile_frames:
+            try:
+                profiler.export(args.profile_frames)
+            except OSError as e:
+                print(f"Could not write the frame profile: {e}")
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,249 @@
+"""Bigram sentence model compiled from a corpus into flat arrays.
+
+Train with ``python -m typegame.ngram SOURCE... -o model.tgng`` and start the
+game with ``--model model.tgng``.
+
+The model is a table of successor rows in CSR form: row 0 holds the words
+that start a sentence and row k the words that follow word k. Each row
+carries its own Walker alias table, so picking the next word is O(1). On
+disk the arrays follow a small header and are used in place through mmap,
+with no per-word Python objects besides the vocabulary strings.
+"""
+
+import argparse
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import tempfile
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .corpus import CHUNK_LINES, CorpusFilter, count_words, rank_words, read_chunks, tokenize
+from .sampling import alias_table
+
+MAGIC = b"TGNG"
+VERSION = 1
+# magic, format version, vocabulary size, transition count, vocabulary bytes
+_HEADER = struct.Struct("<4sHxxIII")
+
+# Successor id that ends a sentence; word k of the vocabulary has id k + 1
+END = 0
+
+# Sentence boundaries inside a line
+_SENTENCE_END = re.compile(r"[.!?;]+")
+
+# Every word is a candidate: short function words matter most to a language model
+_ALL_WORDS = CorpusFilter(min_len=1, max_len=24, max_run=0, rare_letters="", require_vowel=False)
+
+
+def _pad(size: int) -> int:
+    """Bytes to add after size to reach 4-byte alignment."""
+    return -size % 4
+
+
+def _le_bytes(values: array) -> bytes:
+    """Little-endian bytes of an array (swapped in place on big-endian machines)."""
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def train(paths: Sequence[str], vocabulary_size: int = 5000, max_successors: int = 32,
+          chunk_lines: int = CHUNK_LINES) -> "NgramModel":
+    """Count bigrams over the sources and compile them into a model.
+
+    The vocabulary is the most frequent words; transitions through other
+    words are dropped. Each row keeps its ``max_successors`` most frequent
+    successors.
+    """
+    words = rank_words(count_words(paths, _ALL_WORDS, chunk_lines=chunk_lines), vocabulary_size)
+    ids = {word: i + 1 for i, word in enumerate(words)}
+
+    bigrams: Dict[int, Counter] = {}
+    for _, lines in read_chunks(paths, chunk_lines):
+        for line in lines:
+            for sentence in _SENTENCE_END.split(line):
+                previous = 0  # Row 0: sentence start
+                for word in tokenize(sentence)[0]:
+                    word_id = ids.get(word)
+                    if word_id is None:
+                        previous = None  # Unknown word: no transition into or out of it
+                        continue
+                    if previous is not None:
+                        bigrams.setdefault(previous, Counter())[word_id] += 1
+                    previous = word_id
+                if previous:
+                    bigrams.setdefault(previous, Counter())[END] += 1
+    return compile_model(words, bigrams, max_successors)
+
+
+def compile_model(words: Sequence[str], bigrams: Dict[int, Counter], max_successors: int = 32) -> "NgramModel":
+    """Build the CSR rows and per-row alias tables from bigram counts."""
+    if not bigrams.get(0):
+        raise ValueError("no sentence found in the corpus")
+    offsets = array('I', [0])
+    successors = array('I')
+    aliases = array('I')
+    probs = array('f')
+    for row in range(len(words) + 1):
+        counts = bigrams.get(row)
+        if counts and row == 0:
+            counts = Counter({word: n for word, n in counts.items() if word != END})
+        if counts:
+            top = counts.most_common(max_successors)
+            prob, alias = alias_table([n for _, n in top])
+            successors.extend(word for word, _ in top)
+            aliases.extend(alias)
+            probs.extend(prob)
+        offsets.append(len(successors))
+    return NgramModel(list(words), offsets, successors, aliases, probs)
+
+
+class NgramModel:
+    """Bigram successor table; ``generate()`` walks it one O(1) pick per word."""
+
+    def __init__(self, words: List[str], offsets, successors, aliases, probs, mapping: Optional[mmap.mmap] = None):
+        self.words = words
+        self.offsets = offsets
+        self.successors = successors
+        self.aliases = aliases
+        self.probs = probs
+        self._mapping = mapping
+
+    def save(self, path: str):
+        """Write the model file, replacing any previous one atomically."""
+        vocabulary = "\n".join(self.words).encode("utf-8")
+        # A private temporary file: concurrent saves never write the same one
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                        prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, len(self.words), len(self.successors), len(vocabulary)))
+                f.write(vocabulary + b"\0" * _pad(len(vocabulary)))
+                for typecode, values in (('I', self.offsets), ('I', self.successors),
+                                         ('I', self.aliases), ('f', self.probs)):
+                    f.write(_le_bytes(array(typecode, values)))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "NgramModel":
+        """Map a model file; the arrays are read in place from the mapping."""
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            # Validate everything before taking views, which would pin the mapping
+            magic, version, vocab_size, transitions, vocab_bytes = _HEADER.unpack_from(mapping, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a TypeGame model")
+            vocab_start = _HEADER.size
+            offsets_start = vocab_start + vocab_bytes + _pad(vocab_bytes)
+            if len(mapping) < offsets_start + 4 * (vocab_size + 2 + 3 * transitions):
+                raise ValueError(f"{path} is truncated")
+            if struct.unpack_from("<I", mapping, offsets_start + 4)[0] == 0:
+                raise ValueError(f"{path} has no sentence starts")
+            words = mapping[vocab_start:vocab_start + vocab_bytes].decode("utf-8").split("\n")
+        except (ValueError, struct.error, UnicodeDecodeError):
+            mapping.close()
+            raise
+
+        view = memoryview(mapping)
+        sections = []
+        position = offsets_start
+        for typecode, count in (('I', vocab_size + 2), ('I', transitions), ('I', transitions),
+                                ('f', transitions)):
+            section = view[position:position + 4 * count].cast(typecode)
+            if sys.byteorder == "big":
+                section = array(typecode, section)
+                section.byteswap()
+            sections.append(section)
+            position += 4 * count
+        return cls(words, *sections, mapping=mapping)
+
+    def generate(self, rng: random.Random, min_words: int = 8, max_words: int = 15) -> str:
+        """Random sentence of min_words to max_words words, following the bigrams.
+
+        A sentence that ends early, or reaches a word with no known
+        successor, continues with a new sentence start.
+        """
+        random_ = rng.random
+        offsets = self.offsets
+        successors = self.successors
+        aliases = self.aliases
+        probs = self.probs
+        words = self.words
+
+        sentence_words = []
+        state = 0
+        while len(sentence_words) < max_words:
+            start = offsets[state]
+            count = offsets[state + 1] - start
+            if count == 0:
+                state = 0
+                continue
+            u = random_() * count
+            i = int(u)
+            j = start + i
+            if u - i >= probs[j]:
+                j = start + aliases[j]
+            word_id = successors[j]
+            if word_id == END:
+                if len(sentence_words) >= min_words:
+                    break
+                state = 0
+                continue
+            sentence_words.append(words[word_id - 1])
+            state = word_id
+        return " ".join(sentence_words)
+
+    def close(self):
+        """Release the file mapping."""
+        if self._mapping is not None:
+            self.offsets = self.successors = self.aliases = self.probs = None
+            self._mapping.close()
+            self._mapping = None
+
+
+class NgramGenerator:
+    """Sentence generator with the SentenceGenerator interface, backed by a model."""
+
+    def __init__(self, model: NgramModel, rng: Optional[random.Random] = None):
+        self.model = model
+        self.words = model.words
+        self.rng = rng if rng is not None else random.Random()
+
+    def generate(self, min_words: int = 8, max_words: int = 15) -> str:
+        return self.model.generate(self.rng, min_words, max_words)
+
+    def generate_many(self, n: int, min_words: int = 8, max_words: int = 15) -> List[str]:
+        generate = self.generate
+        return [generate(min_words, max_words) for _ in range(n)]
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    """Train a model from corpus files."""
+    parser = argparse.ArgumentParser(prog="python -m typegame.ngram",
+                                     description="Train a TypeGame sentence model from text files")
+    parser.add_argument("sources", nargs="+", metavar="SOURCE", help="text files")
+    parser.add_argument("-o", "--output", required=True, metavar="MODEL", help="model file to write")
+    parser.add_argument("--vocab", type=int, default=5000, help="vocabulary size (default: 5000)")
+    parser.add_argument("--successors", type=int, default=32,
+                        help="successors kept per word (default: 32)")
+    args = parser.parse_args(argv)
+
+    try:
+        model = train(args.sources, args.vocab, args.successors)
+        model.save(args.output)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Error: {e}")
+    print(f"{len(model.words):,} words, {len(model.successors):,} transitions written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
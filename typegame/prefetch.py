@@ -0,0 +1,49 @@
+"""Prefetch queue of ready-to-display sentences."""
+
+from collections import deque
+from typing import Callable, NamedTuple
+
+from .layout import TextLayout
+
+
+class PreparedSentence(NamedTuple):
+    """A generated sentence together with its display layout."""
+    text: str
+    layout: TextLayout
+
+
+class SentencePrefetcher:
+    """Bounded queue of prepared sentences, topped up during idle frame time.
+
+    ``fill()`` is called by the game loop after a frame has been drawn, so the
+    work of generating and laying out the next sentence happens while the
+    clock would otherwise sleep. ``pop()`` then hands a sentence over with no
+    extra work, falling back to preparing one synchronously if the queue is
+    empty.
+    """
+
+    def __init__(self, prepare: Callable[[], PreparedSentence], capacity: int = 3):
+        self._prepare = prepare
+        self._queue = deque()
+        self.capacity = capacity
+
+    def fill(self, max_items: int = 1) -> int:
+        """Prepare up to max_items sentences if there is room; return how many."""
+        added = 0
+        while added < max_items and len(self._queue) < self.capacity:
+            self._queue.append(self._prepare())
+            added += 1
+        return added
+
+    def pop(self) -> PreparedSentence:
+        """Take the next prepared sentence."""
+        if self._queue:
+            return self._queue.popleft()
+        return self._prepare()
+
+    def clear(self):
+        """Drop prepared sentences (their layout is no longer valid)."""
+        self._queue.clear()
+
+    def __len__(self) -> int:
+        return len(self._queue)
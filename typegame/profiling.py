@@ -0,0 +1,174 @@
+"""Lightweight timing helpers for startup and frame profiling."""
+
+import csv
+import functools
+import json
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Deque, List, NamedTuple, Optional, Tuple
+
+
+class StartupProfiler:
+    """Records how long each startup phase takes (``--profile-startup``).
+
+    When disabled, ``phase()`` returns a shared no-op context so instrumented
+    code pays almost nothing.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases: List[Tuple[str, float]] = []
+        self.reported = False
+        self._origin = time.perf_counter()
+        self._null = nullcontext()
+
+    def phase(self, name: str):
+        """Context manager timing one named phase."""
+        if not self.enabled:
+            return self._null
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        """Add a phase measured elsewhere (e.g. on a background thread)."""
+        if not self.enabled:
+            return
+        self.phases.append((name, seconds))
+        if self.reported:
+            # Deferred work (background loading, lazy loads) finishing after the first frame
+            print(f"[startup] {name:<24} {seconds * 1000:8.1f} ms (after first frame)")
+
+    def report(self):
+        """Print the phases recorded so far and the time to this point, once."""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        for name, seconds in self.phases:
+            print(f"[startup] {name:<24} {seconds * 1000:8.1f} ms")
+        total = time.perf_counter() - self._origin
+        print(f"[startup] {'total to first frame':<24} {total * 1000:8.1f} ms")
+
+
+class FrameRecord(NamedTuple):
+    """Timings of one frame; times are in seconds.
+
+    zones holds (name, depth, start, duration) tuples in start order, with
+    start relative to the frame start.
+    """
+    index: int
+    start: float  # Since the profiler was created
+    duration: float
+    zones: Tuple[Tuple[str, int, float, float], ...]
+
+
+class FrameProfiler:
+    """Per-frame timing of named zones, for the flame bar and trace exports.
+
+    Code is instrumented with ``with profiler.zone("name"):`` or the
+    ``profiled()`` method decorator; zones may nest. Only zones between
+    ``begin_frame()`` and ``end_frame()`` are kept, and the last ``history``
+    frames are buffered. When disabled, ``zone()`` returns a shared no-op
+    context like StartupProfiler.phase().
+    """
+
+    def __init__(self, enabled: bool = False, history: int = 600):
+        self.enabled = enabled
+        self.frames: Deque[FrameRecord] = deque(maxlen=history)
+        self.frame_count = 0
+        self._origin = time.perf_counter()
+        self._frame_start: Optional[float] = None
+        self._zones: List[Optional[Tuple[str, int, float, float]]] = []
+        self._depth = 0
+        self._null = nullcontext()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = time.perf_counter()
+        self._zones = []
+        self._depth = 0
+
+    def end_frame(self):
+        """Close the current frame and add it to the history."""
+        if not self.enabled or self._frame_start is None:
+            return
+        start = self._frame_start
+        self._frame_start = None
+        self.frames.append(FrameRecord(self.frame_count, start - self._origin,
+                                       time.perf_counter() - start, tuple(self._zones)))
+        self.frame_count += 1
+
+    def zone(self, name: str):
+        """Context manager timing one named zone of the current frame."""
+        if not self.enabled or self._frame_start is None:
+            return self._null
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        depth = self._depth
+        index = len(self._zones)
+        self._zones.append(None)  # Keep start order while nested zones are added
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self._zones[index] = (name, depth, start - self._frame_start, time.perf_counter() - start)
+
+    @property
+    def last_frame(self) -> Optional[FrameRecord]:
+        return self.frames[-1] if self.frames else None
+
+    def write_csv(self, path: str):
+        """One row per zone of every buffered frame, times in ms."""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_start_ms", "frame_ms", "zone", "depth", "start_ms", "duration_ms"])
+            for frame in self.frames:
+                head = [frame.index, f"{frame.start * 1000:.3f}", f"{frame.duration * 1000:.3f}"]
+                for name, depth, start, duration in frame.zones:
+                    writer.writerow(head + [name, depth, f"{start * 1000:.3f}", f"{duration * 1000:.3f}"])
+
+    def write_chrome_trace(self, path: str):
+        """Buffered frames as a Chrome trace (chrome://tracing, Perfetto)."""
+        events = []
+        for frame in self.frames:
+            frame_ts = frame.start * 1e6
+            events.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1, "ts": round(frame_ts, 1),
+                           "dur": round(frame.duration * 1e6, 1), "args": {"index": frame.index}})
+            for name, _, start, duration in frame.zones:
+                events.append({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                               "ts": round(frame_ts + start * 1e6, 1), "dur": round(duration * 1e6, 1)})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, path: str):
+        """Write a Chrome trace for ``.json`` paths and CSV otherwise."""
+        if path.endswith(".json"):
+            self.write_chrome_trace(path)
+        else:
+            self.write_csv(path)
+
+
+def profiled(name: str):
+    """Method decorator timing each call as a zone of ``self.profiler``."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if not profiler.enabled:
+                return method(self, *args, **kwargs)
+            with profiler.zone(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
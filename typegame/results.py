@@ -0,0 +1,353 @@
+"""Persistent storage for game results."""
+
+import errno
+import json
+import os
+import re
+import sqlite3
+import stat
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+Result = Dict[str, Any]
+
+_TAIL_BLOCK_SIZE = 8192
+
+# Legacy results file beside the package; the journal lives next to it
+DEFAULT_RESULTS_FILE = os.path.join(os.path.dirname(__file__), '..', 'results.json')
+
+# Player names end up in file names
+_PLAYER_NAME = re.compile(r"[\w-]+")
+
+
+def validate_player(player: str) -> str:
+    """Return the player name, or raise ValueError if it cannot be used in a file name."""
+    if not _PLAYER_NAME.fullmatch(player):
+        raise ValueError(f"invalid player name {player!r} (letters, digits, '_' and '-' only)")
+    return player
+
+
+def player_path(path: str, player: Optional[str]) -> str:
+    """The store path of a player: the player name goes before the extension.
+
+    results.jsonl becomes results.alice.jsonl; no player keeps the path.
+    """
+    if player is None:
+        return path
+    validate_player(player)
+    root, ext = os.path.splitext(path)
+    return f"{root}.{player}{ext}"
+
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive lock shared by every process using ``path``.
+
+    The lock is taken on a ``.lock`` file beside it, so the data file can
+    still be replaced atomically while locked. Blocks until the lock is free.
+    """
+    with open(path + ".lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError as e:
+                    # LK_LOCK gives up after about 10 s: keep waiting
+                    if e.errno != errno.EDEADLOCK:
+                        raise
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _temp_file(path: str) -> Tuple[int, str]:
+    """Create a private temporary file beside path; (descriptor, path).
+
+    Unlike mkstemp (always 0600), the file gets the default permissions of
+    a plain open().
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        tmp_path = os.path.join(directory, f"{name}.{os.urandom(4).hex()}.tmp")
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+
+
+def load_legacy_results(path: str) -> List[Result]:
+    """Read results from a results.json list or a results.jsonl journal."""
+    if path.endswith('.jsonl'):
+        return list(ResultsJournal(path))
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def open_results_store(results_db: Optional[str] = None, results_file: str = DEFAULT_RESULTS_FILE,
+                       player: Optional[str] = None):
+    """Open the results journal, or the SQLite database when a path is given.
+
+    Existing history (journal, else results.json) is imported on first use.
+    A player gets their own journal or database, next to the default one, and
+    starts empty. Nothing is read until results are first needed.
+    """
+    journal_path = os.path.splitext(results_file)[0] + '.jsonl'
+    if player is not None:
+        # The shared history belongs to the default store only
+        journal_path = player_path(journal_path, player)
+        results_file = None
+    if results_db:
+        results_db = player_path(results_db, player)
+        legacy_path = journal_path if os.path.exists(journal_path) else results_file
+        return SQLiteResultsStore(results_db, legacy_path=legacy_path)
+    return ResultsJournal(journal_path, legacy_path=results_file)
+
+
+class ResultsJournal:
+    """Append-only JSON Lines results store.
+
+    Each result is one line, appended and fsync'd on its own, so saving costs
+    the same whatever the history size and nothing is ever truncated. Readers
+    only seek to the end of the file for the records they need. A torn or
+    corrupt line (e.g. after a crash mid-write) is skipped when reading and
+    removed by ``compact()``.
+
+    Several games may share a journal: appends, the legacy import and
+    repairs hold an exclusive file lock, and rewrites go through a private
+    temporary file renamed into place, so no process loses another's
+    results. Reads take no lock; they skip a line still being written.
+    """
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.damaged = False
+        self._checked = False
+
+    def _prepare(self):
+        """Import the legacy JSON file and repair a torn tail, once."""
+        if self._checked:
+            return
+        self._checked = True
+        if os.path.exists(self.path) and not self._torn_tail():
+            return
+        # Checked again under the lock: another game may be importing or
+        # appending right now, and only a tail torn by a crash gets repaired
+        with file_lock(self.path):
+            if not os.path.exists(self.path):
+                self._import_legacy()
+            elif self._torn_tail():
+                self.damaged = True
+                self._compact()
+
+    def _torn_tail(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def _import_legacy(self):
+        """One-shot migration from the old results.json list."""
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        self._rewrite(load_legacy_results(self.legacy_path))
+
+    @staticmethod
+    def _encode(record: Result) -> bytes:
+        return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+    def _decode(self, line: bytes) -> Optional[Result]:
+        try:
+            return json.loads(line)
+        except ValueError:
+            self.damaged = True
+            return None
+
+    def append(self, record: Result):
+        """Durably append one result."""
+        self._prepare()
+        data = self._encode(record)
+        with file_lock(self.path):
+            with open(self.path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def tail(self, n: int) -> List[Result]:
+        """Return the last n results, oldest first, reading only the end of the file."""
+        self._prepare()
+        if n <= 0:
+            return []
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return []
+        with f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+            while pos > 0 and data.count(b"\n") <= n:
+                step = min(_TAIL_BLOCK_SIZE, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+        lines = data.split(b"\n")
+        if pos > 0:
+            lines = lines[1:]  # First line may start mid-record
+        records = [self._decode(line) for line in lines[-(n + 1):] if line.strip()]
+        return [r for r in records if r is not None][-n:]
+
+    def __iter__(self) -> Iterator[Result]:
+        """Stream every stored result, oldest first."""
+        self._prepare()
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                if line.strip():
+                    record = self._decode(line)
+                    if record is not None:
+                        yield record
+
+    def compact(self):
+        """Rewrite the journal without torn or corrupt lines."""
+        self._checked = True
+        with file_lock(self.path):
+            self._compact()
+
+    def _compact(self):
+        # Read and rewritten under the lock: appends wait instead of being lost
+        self._rewrite(list(self))
+        self.damaged = False
+
+    def _rewrite(self, records: List[Result]):
+        # A private temporary file: concurrent rewrites never share one
+        fd, tmp_path = _temp_file(self.path)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                try:
+                    # The rewritten journal keeps the permissions of the old one
+                    os.chmod(tmp_path, stat.S_IMODE(os.stat(self.path).st_mode))
+                except FileNotFoundError:
+                    pass  # New journal
+                for record in records:
+                    f.write(self._encode(record))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+# Columns stored natively; any other result fields go to the JSON "extra" column
+_COLUMNS = ('date', 'wpm', 'accuracy', 'time', 'characters_typed', 'errors', 'sentences_completed')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    wpm INTEGER NOT NULL DEFAULT 0,
+    accuracy REAL NOT NULL DEFAULT 0,
+    time REAL NOT NULL DEFAULT 0,
+    characters_typed INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    sentences_completed INTEGER NOT NULL DEFAULT 0,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS results_date ON results (date);
+CREATE INDEX IF NOT EXISTS results_wpm ON results (wpm);
+"""
+
+# Statements are reused verbatim so sqlite3's statement cache keeps them prepared
+_INSERT_SQL = ("INSERT INTO results (date, wpm, accuracy, time, characters_typed, errors, "
+               "sentences_completed, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+_SELECT_COLUMNS = "date, wpm, accuracy, time, characters_typed, errors, sentences_completed, extra"
+_LAST_N_SQL = f"SELECT {_SELECT_COLUMNS} FROM results ORDER BY date DESC, id DESC LIMIT ?"
+_ALL_SQL = f"SELECT {_SELECT_COLUMNS} FROM results ORDER BY date, id"
+_COUNT_SQL = "SELECT COUNT(*) FROM results"
+
+
+class SQLiteResultsStore:
+    """SQLite results database for long histories and many sessions.
+
+    Dates and WPM are indexed, and "last N" runs in SQL, so the results
+    screen only loads the rows it draws; the history analytics then work on
+    those rows. Offers the same ``append``/``tail``/iteration interface as
+    ``ResultsJournal``.
+    """
+
+    damaged = False
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=10)
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+        if legacy_path and os.path.exists(legacy_path) and self.count() == 0:
+            records = load_legacy_results(legacy_path)
+            # SQLite serializes writers; recheck inside the write transaction so
+            # two games opening a new database import the history only once
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                if self.count() == 0:
+                    self._conn.executemany(_INSERT_SQL, [self._row(r) for r in records])
+
+    @staticmethod
+    def _row(record: Result) -> Tuple:
+        extra = {k: v for k, v in record.items() if k not in _COLUMNS}
+        return tuple(record.get(column, 0) for column in _COLUMNS) + (
+            json.dumps(extra, ensure_ascii=False) if extra else None,)
+
+    @staticmethod
+    def _record(row: Tuple) -> Result:
+        record = dict(zip(_COLUMNS, row))
+        if row[-1]:
+            record.update(json.loads(row[-1]))
+        return record
+
+    def append(self, record: Result):
+        """Insert one result (committed immediately)."""
+        with self._conn:
+            self._conn.execute(_INSERT_SQL, self._row(record))
+
+    def tail(self, n: int) -> List[Result]:
+        """Return the last n results, oldest first."""
+        if n <= 0:
+            return []
+        rows = self._conn.execute(_LAST_N_SQL, (n,)).fetchall()
+        return [self._record(row) for row in reversed(rows)]
+
+    def __iter__(self) -> Iterator[Result]:
+        for row in self._conn.execute(_ALL_SQL):
+            yield self._record(row)
+
+    def count(self) -> int:
+        return self._conn.execute(_COUNT_SQL).fetchone()[0]
+
+    def compact(self):
+        """Reclaim free pages."""
+        self._conn.execute("VACUUM")
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,86 @@
+"""Weighted random choice in O(1) with Walker alias tables."""
+
+import random
+from typing import Dict, Generic, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# How much a word's weight grows per unit of error rate of its letters
+WEAK_LETTER_BOOST = 4.0
+
+
+def alias_table(weights: Sequence[float]) -> Tuple[List[float], List[int]]:
+    """Walker alias table for weights, built in O(n) with Vose's method.
+
+    Picking column i uniformly, then keeping i with probability prob[i] and
+    taking alias[i] otherwise, yields each index in proportion to its weight.
+    """
+    size = len(weights)
+    total = float(sum(weights))
+    if size == 0 or total <= 0:
+        raise ValueError("need at least one positive weight")
+    prob = [1.0] * size
+    alias = list(range(size))
+
+    factor = size / total
+    scaled = [weight * factor for weight in weights]
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        # Fill a short column with the top of a tall one; the tall one
+        # stays on its stack until it becomes short itself
+        less = small.pop()
+        more = large[-1]
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] += scaled[less] - 1.0
+        if scaled[more] < 1.0:
+            small.append(large.pop())
+    # Whatever is left is 1.0 up to rounding error: keeps prob 1, alias itself
+    return prob, alias
+
+
+class AliasSampler(Generic[T]):
+    """Picks items with probability proportional to their weights.
+
+    The alias table is built once in O(n); each pick then costs one random
+    number, one comparison and one or two list lookups, like
+    ``random.choice``. Build a new sampler when the weights change.
+    """
+
+    def __init__(self, items: Sequence[T], weights: Sequence[float], rng: random.Random):
+        if len(items) != len(weights):
+            raise ValueError("need one weight per item")
+        self.items = list(items)
+        self.rng = rng
+        self.size = len(self.items)
+        # Plain lists: indexing them is faster than arrays in the pick path
+        self.prob, self.alias = alias_table(weights)
+
+    def __call__(self) -> T:
+        # One random number gives both the column and the coin flip
+        u = self.rng.random() * self.size
+        i = int(u)
+        if u - i < self.prob[i]:
+            return self.items[i]
+        return self.items[self.alias[i]]
+
+
+def frequency_weights(count: int, exponent: float = 1.0) -> List[float]:
+    """Zipf weights for items listed from most to least frequent."""
+    if exponent == 1.0:
+        return [1.0 / rank for rank in range(1, count + 1)]
+    return [1.0 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def weak_letter_weights(words: Sequence[str], weights: Sequence[float],
+                        weak_letters: Dict[str, float]) -> List[float]:
+    """Weights raised for words containing letters the player often mistypes.
+
+    weak_letters maps a letter to its error rate (0 to 1).
+    """
+    if not weak_letters:
+        return weights
+    get = weak_letters.get
+    return [weight * (1.0 + WEAK_LETTER_BOOST * sum(get(char, 0.0) for char in set(word)))
+            for word, weight in zip(words, weights)]
@@ -0,0 +1,61 @@
+"""Screen geometry for any window size, computed once per resize."""
+
+from typing import NamedTuple, Tuple
+
+import pygame
+
+# Size the screens were designed at: coordinates and font sizes are given for it
+DESIGN_WIDTH = 800
+DESIGN_HEIGHT = 600
+
+# Below this the text becomes unreadable; smaller windows just crop
+MIN_SCALE = 0.5
+
+
+def ui_scale(width: int, height: int) -> float:
+    """Factor from design pixels to window pixels, keeping proportions."""
+    return max(MIN_SCALE, min(width / DESIGN_WIDTH, height / DESIGN_HEIGHT))
+
+
+def scaled(value: float, scale: float) -> int:
+    """A design-pixel length at the given scale (at least 1 pixel)."""
+    return max(1, round(value * scale))
+
+
+class PlayingLayout(NamedTuple):
+    """Regions and anchors of the typing screen for one window size."""
+    stats_rect: pygame.Rect
+    stats_y: int
+    stats_xs: Tuple[int, ...]
+    debug_rect: pygame.Rect
+    debug_ys: Tuple[int, int]
+    latency_rect: pygame.Rect
+    text_x: int
+    text_y: int
+    text_width: int
+    footer_rect: pygame.Rect
+
+    @property
+    def footer_y(self) -> int:
+        return self.footer_rect.top
+
+
+def playing_layout(width: int, height: int, scale: float) -> PlayingLayout:
+    """Lay out the typing screen: stats at the top, text centered, footer at the bottom."""
+    def px(value: float) -> int:
+        return scaled(value, scale)
+
+    stats_y = px(30)
+    footer_y = height - px(95)
+    return PlayingLayout(
+        stats_rect=pygame.Rect(0, stats_y - px(5), width, px(25)),
+        stats_y=stats_y,
+        stats_xs=tuple(px(x) for x in (50, 200, 350, 550)),
+        debug_rect=pygame.Rect(0, stats_y + px(20), width, px(40)),
+        debug_ys=(stats_y + px(25), stats_y + px(45)),
+        latency_rect=pygame.Rect(0, stats_y + px(65), width, px(20)),
+        text_x=px(50),
+        text_y=height // 2 - px(60),
+        text_width=width - 2 * px(50),
+        footer_rect=pygame.Rect(0, footer_y, width, height - footer_y),
+    )
@@ -0,0 +1,105 @@
+"""Sentence generation from precomputed word-category pools."""
+
+import random
+from typing import Dict, List, Optional, Sequence
+
+from .sampling import AliasSampler, frequency_weights, weak_letter_weights
+
+ARTICLES = frozenset(['the', 'a', 'an'])
+COMMON_WORDS = frozenset(['i', 'you', 'he', 'she', 'it', 'we', 'they', 'is', 'are', 'was',
+                          'were', 'have', 'has', 'had', 'do', 'does', 'can', 'will', 'would'])
+CONNECTORS = frozenset(['and', 'or', 'but', 'with', 'from', 'to', 'in', 'on', 'at', 'for'])
+
+
+class SentenceGenerator:
+    """Generates natural-looking sentences from a word list.
+
+    The category pools are built once from the vocabulary, so generating a
+    sentence only costs a few O(1) random picks per word.
+
+    The vocabulary is taken to be ordered from most to least frequent, and
+    words are picked with Zipf weights by rank (``frequency_exponent`` 0
+    picks uniformly). Words containing the player's weak letters can be
+    favoured too. Each pool has an alias table, rebuilt only when the
+    weights change.
+    """
+
+    def __init__(self, words: Sequence[str], rng: Optional[random.Random] = None,
+                 frequency_exponent: float = 1.0, weak_letters: Optional[Dict[str, float]] = None):
+        self.words = list(words)
+        self.rng = rng if rng is not None else random.Random()
+        self.frequency_exponent = frequency_exponent
+        self.weak_letters: Optional[Dict[str, float]] = None  # Set with the samplers below
+
+        # Pools keep the vocabulary order so sampling matches the word list
+        self.articles = [w for w in self.words if w in ARTICLES]
+        self.common_words = [w for w in self.words if w in COMMON_WORDS]
+        self.connectors = [w for w in self.words if w in CONNECTORS]
+        self.other_words = [w for w in self.words if len(w) >= 3 and w not in COMMON_WORDS] or self.words
+
+        # Frequency weight of each word, from its first position in the vocabulary
+        # (built in reverse so earlier duplicates win)
+        weights = frequency_weights(len(self.words), frequency_exponent)
+        self._base_weights = dict(zip(reversed(self.words), reversed(weights)))
+        self.set_weak_letters(weak_letters or {})
+
+    def set_weak_letters(self, weak_letters: Dict[str, float]):
+        """Favour words with these letters (letter -> error rate); cheap if unchanged."""
+        if weak_letters == self.weak_letters:
+            return
+        self.weak_letters = dict(weak_letters)
+        # One sampler per pool; empty pools have none and are skipped by generate()
+        self.pick_article, self.pick_common, self.pick_connector, self.pick_other = (
+            self._sampler(pool) for pool in
+            (self.articles, self.common_words, self.connectors, self.other_words))
+
+    def _sampler(self, pool: List[str]) -> Optional[AliasSampler]:
+        if not pool:
+            return None
+        weights = weak_letter_weights(pool, list(map(self._base_weights.__getitem__, pool)),
+                                      self.weak_letters)
+        return AliasSampler(pool, weights, self.rng)
+
+    def generate(self, min_words: int = 8, max_words: int = 15) -> str:
+        """Generate a more natural sentence structure."""
+        if not self.words:
+            return "no words available"
+
+        rng_random = self.rng.random
+        articles = self.articles
+        common_words = self.common_words
+        connectors = self.connectors
+        pick_article = self.pick_article
+        pick_common = self.pick_common
+        pick_connector = self.pick_connector
+        pick_other = self.pick_other
+
+        sentence_words = []
+        num_words = self.rng.randint(min_words, max_words)
+
+        # Try to create more natural sentence patterns
+        if articles and rng_random() < 0.6:  # 60% chance to start with article
+            sentence_words.append(pick_article())
+            num_words -= 1
+        elif common_words and rng_random() < 0.8:  # 80% chance to start with common word
+            sentence_words.append(pick_common())
+            num_words -= 1
+
+        # Fill the rest with a more varied mix for longer sentences
+        for i in range(num_words):
+            rand = rng_random()
+            if common_words and rand < 0.3:  # 30% chance for common words
+                sentence_words.append(pick_common())
+            elif articles and rand < 0.4 and i > 0:  # 10% chance for mid-sentence articles
+                sentence_words.append(pick_article())
+            elif rand < 0.5 and connectors and len(sentence_words) > 2:  # 10% chance for connecting words
+                sentence_words.append(pick_connector())
+            else:  # Other vocabulary words
+                sentence_words.append(pick_other())
+
+        return " ".join(sentence_words)
+
+    def generate_many(self, n: int, min_words: int = 8, max_words: int = 15) -> List[str]:
+        """Generate n sentences in one batch (e.g. for practice-set export)."""
+        generate = self.generate
+        return [generate(min_words, max_words) for _ in range(n)]
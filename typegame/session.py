@@ -0,0 +1,160 @@
+"""Typing session state and rules, independent of pygame."""
+
+from typing import List, Optional
+
+from .keylog import BACKSPACE, KeystrokeLog
+
+# Outcomes of TypingSession.type_char
+IGNORED = "ignored"
+TYPED = "typed"
+SENTENCE_DONE = "sentence_done"
+GAME_OVER = "game_over"
+
+# Characters accepted besides letters
+PUNCTUATION = ' .,!?;:-'
+
+
+class TypingSession:
+    """One game's typing state: the sentence, what was typed, counters and stats.
+
+    Time is passed in as milliseconds by the caller (pygame ticks in the game,
+    a virtual clock in simulations), so the rules can run headless at full
+    speed. ``sentences_per_game`` and ``time_limit_ms`` may be None for
+    open-ended games, such as long passages.
+
+    Typing state is kept incrementally: typed characters in a list buffer, a
+    per-position correctness bitmap and a running count of mismatched
+    positions. Keystrokes, completion checks and coloring are all O(1)
+    whatever the sentence length. ``revision`` changes on every edit so
+    renderers can tell when the typed state changed.
+    """
+
+    def __init__(self, sentences_per_game: Optional[int] = 3, time_limit_ms: Optional[int] = 60000):
+        self.sentences_per_game = sentences_per_game
+        self.time_limit_ms = time_limit_ms
+        self.sentence = ""
+        self.typed_chars: List[str] = []
+        self.correct = bytearray()  # 1 where the typed character matches
+        self.mismatches = 0
+        self.revision = 0
+        self.keylog = KeystrokeLog()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters for a new game (the sentence is kept)."""
+        self.clear_typed()
+        self.score = 0
+        self.wpm = 0
+        self.accuracy = 100.0
+        self.errors = 0
+        self.total_characters_typed = 0
+        self.start_time: Optional[int] = None
+        self.end_time: Optional[int] = None
+        self.keylog.clear()
+
+    def start_sentence(self, sentence: str):
+        """Switch to a new sentence; cumulative stats are kept."""
+        self.sentence = sentence
+        self.correct = bytearray(len(sentence))
+        self.clear_typed()
+
+    def clear_typed(self):
+        """Forget what was typed in the current sentence."""
+        self.typed_chars = []
+        self.mismatches = 0
+        self.revision += 1
+
+    @property
+    def typed_count(self) -> int:
+        return len(self.typed_chars)
+
+    @property
+    def typed_text(self) -> str:
+        """What was typed so far (built on demand; prefer the incremental state)."""
+        return "".join(self.typed_chars)
+
+    @property
+    def sentence_complete(self) -> bool:
+        return self.mismatches == 0 and len(self.typed_chars) == len(self.sentence)
+
+    def is_correct(self, index: int) -> bool:
+        """Whether the typed character at index matches the sentence."""
+        return bool(self.correct[index])
+
+    def time_is_up(self, now: int) -> bool:
+        return (self.time_limit_ms is not None and self.start_time is not None
+                and (now - self.start_time) > self.time_limit_ms)
+
+    def type_char(self, char: str, now: int) -> str:
+        """Apply one typed character and return the outcome."""
+        # Start timer on first keystroke
+        if self.start_time is None:
+            self.start_time = now
+
+        # Allow letters, spaces, and basic punctuation (keys such as Shift
+        # come with an empty string, which ``in`` would accept)
+        if len(char) != 1 or not (char.isalpha() or char in PUNCTUATION):
+            return IGNORED
+        typed_char = char.lower()
+
+        # PREVENT typing beyond sentence length
+        index = len(self.typed_chars)
+        if index >= len(self.sentence):
+            return IGNORED
+
+        # Check if the character matches what should be typed
+        expected_char = self.sentence[index].lower()
+        is_correct = typed_char == expected_char
+        if not is_correct:
+            self.errors += 1
+            self.mismatches += 1
+        self.correct[index] = is_correct
+        self.keylog.record(now, expected_char, typed_char)
+
+        self.typed_chars.append(typed_char)
+        self.total_characters_typed += 1
+        self.revision += 1
+
+        if self.sentence_complete:
+            self.score += 1
+            # End game after the sentence quota or the time limit
+            quota_reached = self.sentences_per_game is not None and self.score >= self.sentences_per_game
+            if quota_reached or self.time_is_up(now):
+                return GAME_OVER
+            return SENTENCE_DONE
+
+        # Also end if time limit reached during typing
+        if self.time_is_up(now):
+            return GAME_OVER
+        return TYPED
+
+    def backspace(self, now: Optional[int] = None) -> bool:
+        """Remove the last typed character; False if there was nothing to remove.
+
+        When ``now`` is given the correction is recorded in the keystroke log.
+        """
+        if not self.typed_chars:
+            return False
+        self.typed_chars.pop()
+        if not self.correct[len(self.typed_chars)]:
+            self.mismatches -= 1
+        self.revision += 1
+        if now is not None:
+            self.keylog.record(now, "", BACKSPACE)
+        return True
+
+    def calculate_stats(self, now: int):
+        """Calculate WPM and accuracy - fixed to match Monkeytype standards."""
+        if self.start_time is not None and self.total_characters_typed > 0:
+            elapsed_time = (now - self.start_time) / 1000.0 / 60.0  # minutes
+            if elapsed_time > 0.01:  # Avoid division by very small numbers
+                # Monkeytype-style WPM: total characters typed / 5 / minutes
+                # This includes all keystrokes (correct + incorrect)
+                self.wpm = int((self.total_characters_typed / 5.0) / elapsed_time)
+
+                # Cap WPM at reasonable maximum to avoid display issues
+                self.wpm = min(self.wpm, 999)
+
+            # Accuracy calculation based on total keystrokes vs errors
+            self.accuracy = ((self.total_characters_typed - self.errors) / self.total_characters_typed) * 100
+            self.accuracy = max(0, min(100, self.accuracy))  # Clamp between 0-100
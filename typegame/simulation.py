@@ -0,0 +1,94 @@
+"""Headless simulation: replay keystroke streams through a TypingSession."""
+
+import json
+import random
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .keylog import BACKSPACE
+from .session import GAME_OVER, SENTENCE_DONE, TypingSession
+
+# (milliseconds since the previous keystroke, character)
+Keystroke = Tuple[int, str]
+
+
+class ReplayResult(NamedTuple):
+    """Summary of a replayed stream."""
+    events: int
+    games: int
+    sentences: int
+    elapsed_ms: int
+
+
+def replay(keystrokes: Iterable[Keystroke], next_sentence: Callable[[], str],
+           session: Optional[TypingSession] = None, restart: bool = True) -> ReplayResult:
+    """Feed a keystroke stream through a session on a virtual clock.
+
+    ``next_sentence`` supplies sentences as they are completed. When a game
+    ends it is restarted if ``restart`` is true, otherwise replay stops, so
+    arbitrarily long streams can be used for load testing.
+    """
+    session = session if session is not None else TypingSession()
+    if not session.sentence:
+        session.start_sentence(next_sentence())
+
+    now = 0
+    events = games = sentences = 0
+    for delta, char in keystrokes:
+        now += delta
+        events += 1
+        if char == BACKSPACE:
+            session.backspace(now)
+            continue
+        outcome = session.type_char(char, now)
+        if outcome == SENTENCE_DONE:
+            sentences += 1
+            session.start_sentence(next_sentence())
+        elif outcome == GAME_OVER:
+            sentences += 1
+            games += 1
+            session.calculate_stats(now)
+            if not restart:
+                break
+            session.reset()
+            session.start_sentence(next_sentence())
+    return ReplayResult(events, games, sentences, now)
+
+
+def synthetic_typist(session: TypingSession, chars_per_minute: int = 300,
+                     error_rate: float = 0.03, rng: Optional[random.Random] = None,
+                     limit: Optional[int] = None) -> Iterator[Keystroke]:
+    """Generate keystrokes that type whatever the session expects next.
+
+    Mistakes are made with probability ``error_rate`` and corrected with a
+    backspace, like a real typist. Intervals jitter around the target speed.
+    """
+    rng = rng if rng is not None else random.Random()
+    mean_delta = 60000.0 / chars_per_minute
+    count = 0
+    while limit is None or count < limit:
+        index = session.typed_count
+        delta = max(1, int(rng.gauss(mean_delta, mean_delta / 4)))
+        if index and not session.is_correct(index - 1):
+            keystroke = (delta, BACKSPACE)
+        elif index < len(session.sentence):
+            expected = session.sentence[index]
+            if rng.random() < error_rate:
+                expected = "x" if expected != "x" else "z"
+            keystroke = (delta, expected)
+        else:
+            return
+        count += 1
+        yield keystroke
+
+
+def write_keystrokes(path: str, keystrokes: Iterable[Keystroke]):
+    """Save a recorded stream, one JSON [delta, char] pair per line."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for delta, char in keystrokes:
+            f.write(json.dumps([delta, char]) + "\n")
+
+
+def read_keystrokes(path: str) -> List[Keystroke]:
+    """Load a stream saved by write_keystrokes."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [tuple(json.loads(line)) for line in f if line.strip()]
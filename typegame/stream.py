@@ -0,0 +1,134 @@
+"""Long passages: words streamed lazily and laid out a few lines at a time."""
+
+from collections import deque
+from itertools import chain, islice
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import pygame
+
+from .layout import TextLayout
+from .session import PUNCTUATION
+
+# Lines laid out ahead of the one being typed
+LOOKAHEAD = 8
+
+
+def clean_word(word: str) -> str:
+    """Lowercase a word and drop the characters the game does not accept."""
+    return "".join(char for char in word.lower() if char.isalpha() or char in PUNCTUATION)
+
+
+def file_words(path: str) -> Iterator[str]:
+    """Words of a text file, read line by line as they are needed."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            for word in line.split():
+                word = clean_word(word)
+                if word:
+                    yield word
+
+
+def generated_words(generate: Callable[[], str]) -> Iterator[str]:
+    """Endless words from a sentence generator."""
+    while True:
+        yield from generate().split()
+
+
+class PassageLine(NamedTuple):
+    """One laid-out line of a passage, with plain renderings cached by (color, background)."""
+    layout: TextLayout
+    surfaces: Dict[Tuple[Tuple[int, int, int], Tuple[int, int, int]], pygame.Surface]
+
+
+class PassageWindow:
+    """Sliding window over a passage of any length.
+
+    Words are pulled from the iterator only when a new line is needed, so the
+    window holds the last completed line, the line being typed and
+    ``lookahead`` upcoming lines, whatever the passage length. Every line but
+    the last ends with the space that leads to the next one, so typing a
+    line means typing that space too.
+    """
+
+    def __init__(self, words: Iterable[str], font: pygame.font.Font, max_width: int,
+                 glyph_width: Callable[[str], int], lookahead: int = LOOKAHEAD, line_spacing: int = 10):
+        self._words = iter(words)
+        self._pending: Optional[str] = next(self._words, None)
+        self.font = font
+        self.max_width = max_width
+        self.glyph_width = glyph_width
+        self.line_spacing = line_spacing
+        self.lookahead = lookahead
+        self.previous: Optional[PassageLine] = None
+        self._lines: Deque[PassageLine] = deque()
+        self.lines_read = 0
+
+    def _read_line(self) -> Optional[str]:
+        """Next wrapped line of text, or None at the end of the passage."""
+        if self._pending is None:
+            return None
+        line = self._pending
+        self._pending = next(self._words, None)
+        while self._pending is not None:
+            test_line = line + " " + self._pending
+            # Leave room for the trailing space so the line lays out as one line
+            if self.font.size(test_line + " ")[0] > self.max_width:
+                break
+            line = test_line
+            self._pending = next(self._words, None)
+        return line + " " if self._pending is not None else line
+
+    def _fill(self):
+        """Lay out lines until the lookahead is full or the passage ends."""
+        while len(self._lines) <= self.lookahead:
+            text = self._read_line()
+            if text is None:
+                break
+            self._lines.append(self._line(text))
+            self.lines_read += 1
+
+    def _line(self, text: str) -> PassageLine:
+        return PassageLine(TextLayout(text, self.font, self.max_width, self.glyph_width, self.line_spacing), {})
+
+    @property
+    def current(self) -> Optional[PassageLine]:
+        return self._lines[0] if self._lines else None
+
+    def upcoming(self) -> List[PassageLine]:
+        """Laid-out lines after the current one."""
+        return list(islice(self._lines, 1, None))
+
+    def next_line(self) -> Optional[PassageLine]:
+        """Move to the next line (the first one on the first call); None at the end."""
+        if self.lines_read and self._lines:
+            self.previous = self._lines.popleft()
+        self._fill()
+        return self.current
+
+    def relayout(self, font: pygame.font.Font, max_width: int, glyph_width: Callable[[str], int],
+                 line_spacing: int = 10):
+        """Lay the window out again for a new font or width (window resize).
+
+        The current and previous lines keep their text, so typing progress is
+        kept (a line may now wrap over several rows, see ``TextLayout.height``);
+        the upcoming lines are wrapped again from their words.
+        """
+        upcoming = self.upcoming()
+        words = [word for line in upcoming for word in line.layout.text.split()]
+        if self._pending is not None:
+            words.append(self._pending)
+        self._words = chain(words, self._words)
+        self._pending = next(self._words, None)
+        self.font = font
+        self.max_width = max_width
+        self.glyph_width = glyph_width
+        self.line_spacing = line_spacing
+
+        current = self.current
+        self._lines.clear()
+        if current is not None:
+            self._lines.append(self._line(current.layout.text))
+        if self.previous is not None:
+            self.previous = self._line(self.previous.layout.text)
+        self.lines_read -= len(upcoming)
+        self._fill()
@@ -0,0 +1,180 @@
+"""Offscreen rendering of the typing-area sentence, patched per keystroke."""
+
+import string
+from typing import NamedTuple, Tuple
+
+import pygame
+
+from .glyphs import GlyphAtlas
+from .layout import TextLayout
+from .session import PUNCTUATION, TypingSession
+
+Color = Tuple[int, int, int]
+
+# Dark red background behind mistyped spaces
+ERROR_HIGHLIGHT = (80, 20, 20)
+
+
+class TypingColors(NamedTuple):
+    """Theme colors used to draw the sentence."""
+    bg: Color
+    inactive: Color
+    correct: Color
+    incorrect: Color
+    current: Color
+
+
+def line_surface(layout: TextLayout, atlas: GlyphAtlas, color: Color, bg: Color) -> pygame.Surface:
+    """A laid-out line drawn in a single color, for lines that are not being typed.
+
+    A line wrapped again after a resize keeps its rows.
+    """
+    width = max(layout.line_widths, default=0)
+    height = layout.height - layout.line_height + layout.font.get_height()
+    surface = pygame.Surface((max(width, 1), height))
+    surface.fill(bg)
+    position = layout.position
+    surface.blits([(atlas.get(char, color), position(index)[1:])
+                   for index, char in enumerate(layout.text)], doreturn=False)
+    return surface
+
+
+class SentenceSurface:
+    """The sentence drawn once into an offscreen surface.
+
+    A keystroke changes the state of at most two characters (the one typed or
+    erased and the new current one), so ``patch()`` repaints only those cells
+    and whatever glyphs overlap them, clipped to the damaged area. Drawing a
+    frame is then a single blit whatever the sentence length.
+
+    The surface has a ``margin`` on the left for the marker shown when the
+    space at a line break is mistyped, outlined with a ``border``; both are
+    given in window pixels (``MARGIN`` and ``BORDER`` at the design size).
+    ``revision`` is the session revision the surface shows; the owner
+    re-renders when it falls behind.
+    """
+
+    MARGIN = 20
+    BORDER = 2
+
+    def __init__(self, layout: TextLayout, atlas: GlyphAtlas, colors: TypingColors,
+                 margin: int = MARGIN, border: int = BORDER):
+        self.layout = layout
+        self.atlas = atlas
+        self.colors = colors
+        self.margin = margin
+        self.border = border
+        self.font_height = layout.font.get_height()
+        # Widest area a cell can cover: its widest possible glyph plus highlight border
+        self.cell_extent = max(atlas.width(char) for char in
+                               set(string.ascii_lowercase + PUNCTUATION + layout.text)) + 2 * border
+        width = margin + layout.max_width + self.cell_extent
+        height = max(1, len(layout.lines)) * layout.line_height
+        self.surface = pygame.Surface((width, height))
+        self.revision = None
+
+    def render(self, session: TypingSession):
+        """Draw the whole sentence for the session's current typing state."""
+        self.surface.fill(self.colors.bg)
+        self._paint(session, range(len(self.layout.text)))
+        self.revision = session.revision
+
+    def patch(self, session: TypingSession, start: int, stop: int):
+        """Repaint characters start..stop-1 after one edit changed their typing state.
+
+        If the surface missed an earlier edit it is rendered again in full.
+        """
+        if self.revision != session.revision - 1:
+            self.render(session)
+            return
+        stop = min(stop, len(self.layout.text))
+        layout = self.layout
+        index = max(start, 0)
+        while index < stop:
+            # Patch one line at a time: cells never overlap across lines
+            line = layout.char_line[index]
+            first, last = self._line_range(line)
+            end = min(stop, last)
+            x0 = self._left(index)
+            x1 = self._left(end - 1) + self.cell_extent
+
+            # Neighbours whose glyphs reach into the damaged span
+            lo = index
+            while lo > first and self._left(lo - 1) + self.cell_extent > x0:
+                lo -= 1
+            hi = end
+            while hi < last and self._left(hi) < x1:
+                hi += 1
+
+            clip = pygame.Rect(x0, line * layout.line_height, x1 - x0, layout.line_height)
+            self.surface.set_clip(clip)
+            self.surface.fill(self.colors.bg)
+            self._paint(session, range(lo, hi))
+            self.surface.set_clip(None)
+            index = end
+        self.revision = session.revision
+
+    def _line_range(self, line: int) -> Tuple[int, int]:
+        """Character indices [first, last) drawn on a line, its break space included."""
+        layout = self.layout
+        first = layout.line_starts[line]
+        last = first + len(layout.lines[line])
+        if first - 1 in layout.line_breaks:
+            first -= 1
+        return first, last
+
+    def _left(self, index: int) -> int:
+        """Left edge of a cell on the surface."""
+        if index in self.layout.line_breaks:
+            return 0
+        return self.margin + self.layout.char_x[index]
+
+    def _paint(self, session: TypingSession, indices):
+        """Draw cells without clearing: highlights first, then all glyphs on top."""
+        layout = self.layout
+        atlas = self.atlas
+        colors = self.colors
+        text = layout.text
+        typed_chars = session.typed_chars
+        correct = session.correct
+        typed_count = len(typed_chars)
+        surface = self.surface
+        margin = self.margin
+        border = self.border
+
+        glyph_blits = []
+        for index in indices:
+            char = text[index]
+            y = layout.char_line[index] * layout.line_height
+
+            if index in layout.line_breaks:
+                # Space split between lines: only shown when mistyped, with the
+                # incorrect character highlighted at the start of the next line
+                if index < typed_count and not correct[index]:
+                    error_surface = atlas.get(typed_chars[index], colors.incorrect)
+                    highlight_rect = pygame.Rect(0, y, error_surface.get_width() + 2 * border, self.font_height)
+                    pygame.draw.rect(surface, ERROR_HIGHLIGHT, highlight_rect)
+                    pygame.draw.rect(surface, colors.incorrect, highlight_rect, border)
+                    glyph_blits.append((error_surface, (border, y)))
+                continue
+
+            x = margin + layout.char_x[index]
+            display_char = char
+            if index < typed_count:
+                if correct[index]:
+                    char_color = colors.correct
+                else:
+                    char_color = colors.incorrect
+                    if char == ' ':
+                        # Show what was typed instead of an invisible space
+                        display_char = typed_chars[index]
+                        highlight_rect = pygame.Rect(x, y, atlas.width(display_char), self.font_height)
+                        pygame.draw.rect(surface, ERROR_HIGHLIGHT, highlight_rect)
+            elif index == typed_count:
+                char_color = colors.current
+            else:
+                char_color = colors.inactive
+
+            glyph_blits.append((atlas.get(display_char, char_color), (x, y)))
+
+        surface.blits(glyph_blits, doreturn=False)
@@ -0,0 +1,94 @@
+"""Clickable widgets: rects and actions registered per game state, found by position."""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pygame
+
+# Side of a hit-grid cell in pixels: a few widgets per cell at most
+CELL_SIZE = 64
+
+
+class Widget(NamedTuple):
+    name: str
+    rect: pygame.Rect
+    action: Callable[[], None]
+
+
+class HitGrid:
+    """Widgets of one screen bucketed by the grid cells they overlap.
+
+    A point lookup only tests the widgets of its cell, so its cost does not
+    grow with the number of widgets on screen. Registering a name again
+    replaces the widget (e.g. after a resize or a label change).
+    """
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self.widgets: Dict[str, Widget] = {}
+        self._cells: Dict[Tuple[int, int], List[Widget]] = {}
+
+    def _cell_keys(self, rect: pygame.Rect):
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cell_x, cell_y
+
+    def add(self, widget: Widget):
+        old = self.widgets.get(widget.name)
+        if old == widget:
+            return
+        if old is not None:
+            self.remove(widget.name)
+        self.widgets[widget.name] = widget
+        for key in self._cell_keys(widget.rect):
+            self._cells.setdefault(key, []).append(widget)
+
+    def remove(self, name: str):
+        widget = self.widgets.pop(name, None)
+        if widget is None:
+            return
+        for key in self._cell_keys(widget.rect):
+            cell = self._cells[key]
+            cell.remove(widget)
+            if not cell:
+                del self._cells[key]
+
+    def hit(self, pos: Tuple[int, int]) -> Optional[Widget]:
+        """The widget under pos; the most recently registered wins on overlap."""
+        cell = self._cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size))
+        if cell:
+            for widget in reversed(cell):
+                if widget.rect.collidepoint(pos):
+                    return widget
+        return None
+
+
+class WidgetRegistry:
+    """One hit grid per game state; only the current state's widgets are hit-tested.
+
+    Draw code registers each button as it draws it, so the rects always
+    match the screen.
+    """
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self._grids: Dict[str, HitGrid] = {}
+
+    def register(self, state: str, name: str, rect, action: Callable[[], None]):
+        grid = self._grids.get(state)
+        if grid is None:
+            grid = self._grids[state] = HitGrid(self.cell_size)
+        grid.add(Widget(name, pygame.Rect(rect), action))
+
+    def unregister(self, state: str, name: str):
+        grid = self._grids.get(state)
+        if grid is not None:
+            grid.remove(name)
+
+    def get(self, state: str, name: str) -> Optional[Widget]:
+        grid = self._grids.get(state)
+        return grid.widgets.get(name) if grid is not None else None
+
+    def hit(self, state: str, pos: Tuple[int, int]) -> Optional[Widget]:
+        grid = self._grids.get(state)
+        return grid.hit(pos) if grid is not None else None
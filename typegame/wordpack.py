@@ -0,0 +1,65 @@
+"""Compiled word packs: small binary word lists loaded through mmap."""
+
+import mmap
+import os
+import struct
+import tempfile
+from typing import List, Optional
+
+MAGIC = b"TGWP"
+VERSION = 1
+# magic, format version, key length, word count
+_HEADER = struct.Struct("<4sHHI")
+
+
+def source_key(path: str, **params) -> str:
+    """Build a cache key from a source file's mtime/size and the filter parameters."""
+    stat = os.stat(path)
+    parts = [str(stat.st_mtime_ns), str(stat.st_size)]
+    parts.extend(f"{name}={params[name]}" for name in sorted(params))
+    return ";".join(parts)
+
+
+def write_pack(path: str, words: List[str], key: str = "") -> None:
+    """Write words to a pack file, replacing any previous pack atomically."""
+    key_bytes = key.encode("utf-8")
+    payload = "\n".join(words).encode("utf-8")
+    # A private temporary file: games starting together never write the same one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(key_bytes), len(words)))
+            f.write(key_bytes)
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_pack(path: str, key: Optional[str] = None) -> Optional[List[str]]:
+    """Load the words of a pack, or None if it is missing, stale or corrupt.
+
+    When ``key`` is given the pack is only accepted if it was written with the
+    same key, so a changed source file or filter invalidates it.
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, version, key_len, count = _HEADER.unpack_from(data, 0)
+                if magic != MAGIC or version != VERSION:
+                    return None
+                payload_start = _HEADER.size + key_len
+                if key is not None and data[_HEADER.size:payload_start] != key.encode("utf-8"):
+                    return None
+                payload = data[payload_start:].decode("utf-8")
+    except (OSError, ValueError, struct.error, UnicodeDecodeError):
+        return None
+
+    words = payload.split("\n") if payload else []
+    if len(words) != count:
+        return None  # Truncated write
+    return words